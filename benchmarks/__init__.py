@@ -0,0 +1,6 @@
+"""
+Pacote de benchmarks do projeto de regressão.
+
+Contém o gerador de dados sintéticos e a suíte que mede tempo e memória das
+etapas de carregamento, pré-processamento, avaliação e treino dos modelos.
+"""
@@ -0,0 +1,292 @@
+"""
+Suíte de benchmarks dos caminhos críticos de processamento e avaliação.
+
+Mede o tempo (mediana e mínimo de várias repetições) e o pico de memória de
+cada etapa sobre dados sintéticos, salva os resultados em JSON por commit e
+sinaliza regressões em relação a um baseline salvo. A memória é medida de duas
+formas: o pico das alocações Python (tracemalloc) e o pico do RSS do processo
+acima do valor no início da etapa, amostrado em paralelo, que inclui as
+alocações nativas (numpy, scikit-learn, XGBoost).
+
+Uso:
+    python -m benchmarks.run_benchmarks --sizes 1460x80 100000x80 --repeat 5
+    python -m benchmarks.run_benchmarks --save-baseline
+"""
+
+import argparse
+import contextlib
+import ctypes
+import gc
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.linear_model import Ridge
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor
+
+from src.utils.data_processing import (
+    load_data, preprocess_data, create_preprocessor,
+    preencher_valores_numericos, converter_categorias
+)
+from src.utils.evaluation import evaluate_model
+from src.utils.profiling import RSSSampler
+from src.utils.schema import DataSchema
+from benchmarks.synthetic import write_house_prices_csv
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+BASELINE_FILE = RESULTS_DIR / 'baseline.json'
+
+
+def _git_commit() -> str:
+    """Retorna o hash curto do commit atual (ou 'unknown' fora de um repositório)."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _release_memory() -> None:
+    """
+    Devolve ao sistema a memória livre do processo antes de medir uma etapa.
+
+    Sem isso, uma etapa pode reaproveitar páginas liberadas pela anterior e o
+    aumento do RSS subestima o seu pico (só tem efeito com a glibc).
+    """
+    gc.collect()
+    try:
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def _build_stages(data_dir: Path, skip_models: bool) -> List[Tuple[str, Callable[[dict], object]]]:
+    """
+    Monta a lista de etapas a medir.
+
+    Cada etapa recebe um dicionário de estado compartilhado e pode gravar nele
+    o que as etapas seguintes precisam.
+    """
+    def stage_load(state):
+        state['train'], state['test'] = load_data(data_dir)
+
+    def stage_compile_schema(state):
+        # Só avisos: com poucas linhas, o teste sintético tem categorias raras
+        # ausentes do treino, e a etapa mede o custo da validação completa
+        state['schema'] = DataSchema.from_training(state['train'], 'SalePrice', errors=())
+
+    def stage_load_validated(state):
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_data(data_dir, schema=state['schema'])
+
+    def stage_preprocess(state):
+        df, state['num'], state['cat'] = preprocess_data(state['train'], 'SalePrice')
+        state['y'] = np.log1p(df['SalePrice'].values)
+        state['X_df'] = df.drop(columns='SalePrice')
+
+    def stage_fit_transform(state):
+        preprocessor = create_preprocessor(state['num'], state['cat'])
+        state['X'] = preprocessor.fit_transform(state['X_df'])
+
+    def stage_fill(state):
+        preencher_valores_numericos(state['X_df'], state['num'])
+
+    def stage_encode(state):
+        converter_categorias(state['X_df'], state['cat'], metodo='onehot')
+
+    def stage_evaluate(state):
+        y_pred = state['y'] + 0.01
+        with contextlib.redirect_stdout(io.StringIO()):
+            evaluate_model(state['y'], y_pred)
+
+    stages = [
+        ('load_data', stage_load),
+        ('DataSchema.from_training', stage_compile_schema),
+        ('load_data+schema', stage_load_validated),
+        ('preprocess_data', stage_preprocess),
+        ('create_preprocessor.fit_transform', stage_fit_transform),
+        ('preencher_valores_numericos', stage_fill),
+        ('converter_categorias', stage_encode),
+        ('evaluate_model', stage_evaluate),
+    ]
+
+    if not skip_models:
+        models = {
+            'fit_ridge': lambda: Ridge(),
+            'fit_decision_tree': lambda: DecisionTreeRegressor(max_depth=8, random_state=42),
+            'fit_random_forest': lambda: RandomForestRegressor(
+                n_estimators=50, max_depth=12, n_jobs=1, random_state=42),
+        }
+        try:
+            from xgboost import XGBRegressor
+            models['fit_xgboost'] = lambda: XGBRegressor(
+                n_estimators=100, tree_method='hist', n_jobs=1, random_state=42)
+        except ImportError:
+            pass
+
+        for name, factory in models.items():
+            stages.append((name, lambda state, factory=factory: factory().fit(state['X'], state['y'])))
+
+    return stages
+
+
+def run_suite(n_rows: int, n_cols: int, repeat: int = 3, seed: int = 42,
+              skip_models: bool = False) -> Dict[str, dict]:
+    """
+    Executa todas as etapas para um tamanho de dados.
+
+    Args:
+        n_rows: Número de linhas do conjunto sintético
+        n_cols: Número de colunas do conjunto sintético
+        repeat: Número de repetições cronometradas de cada etapa
+        seed: Semente do gerador sintético
+        skip_models: Se True, não mede o treino dos modelos
+
+    Returns:
+        Dicionário com as medições de cada etapa
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = write_house_prices_csv(tmp, n_rows, n_cols, seed=seed)
+        state = {}
+
+        for name, stage in _build_stages(data_dir, skip_models):
+            # Passagem com amostragem do RSS, que inclui as alocações nativas
+            _release_memory()
+            with RSSSampler() as rss:
+                stage(state)
+
+            # Passagem com tracemalloc para o pico das alocações Python
+            tracemalloc.start()
+            stage(state)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                stage(state)
+                times.append(time.perf_counter() - start)
+
+            results[name] = {
+                'wall_median_s': statistics.median(times),
+                'wall_min_s': min(times),
+                'peak_mem_mb': peak / 1024 ** 2,
+                'peak_rss_mb': rss.peak_delta,
+                'rows_per_s': n_rows / max(statistics.median(times), 1e-9),
+            }
+            rss_mb = results[name]['peak_rss_mb']
+            print(f"{name:<36} {results[name]['wall_median_s']:>10.4f}s "
+                  f"{results[name]['peak_mem_mb']:>10.1f} MB "
+                  f"{rss_mb if rss_mb is not None else float('nan'):>10.1f} MB RSS")
+
+    return results
+
+
+def compare_with_baseline(current: dict, baseline: dict, threshold: float = 0.2,
+                          min_delta_s: float = 0.01, min_delta_mb: float = 5.0) -> List[str]:
+    """
+    Compara as medições atuais com o baseline.
+
+    Args:
+        current: Resultados da execução atual
+        baseline: Resultados do baseline
+        threshold: Aumento relativo tolerado no tempo mediano e nos picos de memória
+        min_delta_s: Aumento absoluto mínimo de tempo para contar como regressão,
+                    evitando alarmes por ruído em etapas de poucos milissegundos
+        min_delta_mb: Aumento absoluto mínimo dos picos de memória (tracemalloc
+                     e RSS) para contar como regressão; evita alarmes por ruído
+                     de poucos KB em etapas pequenas e pela variação do RSS
+                     entre execuções
+
+    Returns:
+        Lista com a descrição de cada regressão encontrada
+    """
+    regressions = []
+    for size, stages in current['sizes'].items():
+        for stage, metrics in stages.items():
+            ref = baseline.get('sizes', {}).get(size, {}).get(stage)
+            if ref is None:
+                continue
+            for key in ('wall_median_s', 'peak_mem_mb', 'peak_rss_mb'):
+                if metrics.get(key) is None or ref.get(key) is None:
+                    continue
+                if key == 'wall_median_s' and metrics[key] - ref[key] < min_delta_s:
+                    continue
+                if key != 'wall_median_s' and metrics[key] - ref[key] < min_delta_mb:
+                    continue
+                if ref[key] > 0 and metrics[key] > ref[key] * (1 + threshold):
+                    regressions.append(
+                        f"{size} {stage} {key}: {ref[key]:.4f} -> {metrics[key]:.4f} "
+                        f"(+{(metrics[key] / ref[key] - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', nargs='+', default=['1460x80'],
+                        help="Tamanhos no formato LINHASxCOLUNAS (ex: 1460x80 10000000x2000)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skip-models', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--min-delta', type=float, default=0.01)
+    parser.add_argument('--min-delta-mb', type=float, default=5.0)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    current = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'sizes': {},
+    }
+    for size in args.sizes:
+        n_rows, n_cols = (int(v) for v in size.lower().split('x'))
+        print(f"\n{'='*60}\nBenchmark {n_rows} linhas x {n_cols} colunas\n{'='*60}")
+        current['sizes'][size] = run_suite(n_rows, n_cols, args.repeat, args.seed, args.skip_models)
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    output = RESULTS_DIR / f"{current['commit']}.json"
+    output.write_text(json.dumps(current, indent=2))
+    print(f"\nResultados salvos em {output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2))
+        print(f"Baseline salvo em {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("Nenhum baseline encontrado; use --save-baseline para criar um.")
+        return 0
+
+    regressions = compare_with_baseline(current, json.loads(args.baseline.read_text()),
+                                        args.threshold, args.min_delta, args.min_delta_mb)
+    if regressions:
+        print(f"\nRegressões acima de {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"- {line}")
+        return 1
+
+    print("\nNenhuma regressão em relação ao baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
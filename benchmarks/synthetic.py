@@ -0,0 +1,135 @@
+"""
+Gerador de dados sintéticos com o formato do House Prices.
+
+Este módulo gera DataFrames e arquivos CSV com a mesma mistura de colunas do
+conjunto original (inteiros de área/contagem/ano, categóricas de baixa
+cardinalidade, colunas com muitos valores ausentes e o alvo SalePrice), em
+qualquer número de linhas e colunas.
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Proporções observadas no train.csv original (80 colunas além do Id)
+NUMERIC_FRACTION = 0.46
+# Células (linhas x colunas) geradas por bloco: limita a memória também com milhares de colunas
+CHUNK_CELLS = 50_000_000
+MISSING_RATES = [0.0] * 12 + [0.005, 0.025, 0.055, 0.18, 0.47, 0.6, 0.81, 0.94, 0.99]
+
+
+def _column_specs(n_cols: int, seed: int) -> list:
+    """Sorteia o tipo, a cardinalidade e a taxa de ausentes de cada coluna."""
+    rng = np.random.default_rng(seed)
+    n_features = max(n_cols - 2, 1)  # Id e SalePrice
+    n_numeric = max(int(round(n_features * NUMERIC_FRACTION)), 1)
+
+    specs = []
+    for i in range(n_features):
+        missing = float(rng.choice(MISSING_RATES))
+        if i < n_numeric:
+            kind = ('area', 'count', 'year')[i % 3]
+            specs.append({'name': f'Num{i}', 'kind': kind, 'missing': missing})
+        else:
+            levels = int(rng.choice([2, 3, 4, 5, 5, 6, 8, 10, 15, 25]))
+            specs.append({'name': f'Cat{i}', 'kind': 'category',
+                          'levels': levels, 'missing': missing})
+    return specs
+
+
+def make_house_prices_frame(n_rows: int = 1460, n_cols: int = 81, seed: int = 42,
+                            with_target: bool = True, start_id: int = 1) -> pd.DataFrame:
+    """
+    Gera um DataFrame sintético com o formato do House Prices.
+
+    O esquema das colunas depende apenas de `n_cols` e da semente do esquema
+    (fixa), de modo que blocos gerados com sementes diferentes são compatíveis.
+
+    Args:
+        n_rows: Número de linhas
+        n_cols: Número total de colunas, incluindo Id e SalePrice
+        seed: Semente para os valores gerados
+        with_target: Se True, inclui a coluna SalePrice
+        start_id: Primeiro valor da coluna Id
+
+    Returns:
+        DataFrame sintético
+    """
+    rng = np.random.default_rng(seed)
+    data = {'Id': np.arange(start_id, start_id + n_rows, dtype=np.int64)}
+    # Contribuições centradas em zero, somadas e escaladas pelo número de
+    # features, para que a dispersão do SalePrice não cresça com a largura
+    signal = np.zeros(n_rows)
+    specs = _column_specs(n_cols, seed=0)
+
+    for spec in specs:
+        if spec['kind'] == 'area':
+            values = rng.lognormal(7.0, 0.5, n_rows).round()
+            signal += 0.05 * (np.log(values) - 7.0)
+        elif spec['kind'] == 'count':
+            values = rng.poisson(2.0, n_rows).astype(np.float64)
+            signal += 0.02 * (values - 2.0)
+        elif spec['kind'] == 'year':
+            values = rng.integers(1872, 2011, n_rows).astype(np.float64)
+            signal += 0.002 * (values - 1941.5)
+        else:
+            codes = rng.integers(0, spec['levels'], n_rows)
+            signal += 0.01 * (codes - (spec['levels'] - 1) / 2)
+            values = np.array([f"{spec['name']}_{j}" for j in range(spec['levels'])],
+                              dtype=object)[codes]
+
+        if spec['missing'] > 0:
+            mask = rng.random(n_rows) < spec['missing']
+            if spec['kind'] == 'category':
+                values[mask] = None
+            else:
+                values[mask] = np.nan
+        elif spec['kind'] != 'category':
+            values = values.astype(np.int64)
+
+        data[spec['name']] = values
+
+    if with_target:
+        log_price = 12.0 + signal * np.sqrt(79 / len(specs)) + rng.normal(0, 0.15, n_rows)
+        data['SalePrice'] = np.expm1(log_price).round().astype(np.int64)
+
+    return pd.DataFrame(data)
+
+
+def write_house_prices_csv(data_dir: Union[str, Path], n_rows: int = 1460,
+                           n_cols: int = 81, seed: int = 42,
+                           chunk_rows: Optional[int] = None) -> Path:
+    """
+    Grava `train.csv` e `test.csv` sintéticos em blocos, sem montar tudo em memória.
+
+    O arquivo de teste tem o mesmo número de linhas do treino, como no Kaggle.
+
+    Args:
+        data_dir: Diretório de saída
+        n_rows: Número de linhas de cada arquivo
+        n_cols: Número total de colunas do treino
+        seed: Semente para reprodutibilidade
+        chunk_rows: Número de linhas geradas por bloco (padrão: CHUNK_CELLS
+                   dividido pelo número de colunas)
+
+    Returns:
+        Caminho do diretório com os arquivos
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    if chunk_rows is None:
+        chunk_rows = max(1, CHUNK_CELLS // n_cols)
+
+    for file_name, with_target, offset in (('train.csv', True, 0), ('test.csv', False, n_rows)):
+        with open(data_dir / file_name, 'w', newline='') as f:
+            for chunk_idx, start in enumerate(range(0, n_rows, chunk_rows)):
+                size = min(chunk_rows, n_rows - start)
+                chunk = make_house_prices_frame(
+                    size, n_cols, seed=seed + offset + chunk_idx,
+                    with_target=with_target, start_id=offset + start + 1
+                )
+                chunk.to_csv(f, index=False, header=chunk_idx == 0)
+
+    return data_dir
@@ -10,11 +10,12 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
 
 # Módulos locais
 from src.utils.data_processing import load_data, preprocess_data, create_preprocessor, split_data
-from src.utils.evaluation import evaluate_model, plot_residuals
+from src.utils.evaluation import plot_residuals
+from src.utils.target_transform import TargetTransformRegressor
 
 
 def main():
@@ -25,11 +26,11 @@ def main():
     
     # 2. Pré-processamento
     print("\nPré-processando dados...")
-    train_df, numeric_features, categorical_features = preprocess_data(train_df)
+    train_df, numeric_features, categorical_features = preprocess_data(train_df, target_column='SalePrice')
     
     # Separar features e target
     X = train_df.drop('SalePrice', axis=1)
-    y = np.log1p(train_df['SalePrice'])  # Aplicar log ao target para normalizar
+    y = train_df['SalePrice']  # O log1p é aplicado e desfeito pelo TargetTransformRegressor
     
     # 3. Criar pré-processador
     preprocessor = create_preprocessor(numeric_features, categorical_features)
@@ -39,27 +40,26 @@ def main():
     
     # 5. Criar e treinar modelo dentro de um pipeline
     print("\nTreinando modelo...")
-    model = Pipeline(steps=[
-        ('preprocessor', preprocessor),
-        ('regressor', LinearRegression())
-    ])
+    model = TargetTransformRegressor(
+        Pipeline(steps=[
+            ('preprocessor', preprocessor),
+            ('regressor', LinearRegression())
+        ]),
+        method='log1p'
+    )
     
     model.fit(X_train, y_train)
     
-    # 6. Fazer previsões
-    print("\nFazendo previsões...")
-    y_pred_train = model.predict(X_train)
-    y_pred_test = model.predict(X_test)
-    
-    # 7. Avaliar modelo
+    # 6. Avaliar modelo (métricas na escala log e na escala original)
     print("\nAvaliando modelo no conjunto de treino:")
-    train_metrics = evaluate_model(y_train, y_pred_train, "Regressão Linear (Treino)")
+    train_metrics = model.evaluate(X_train, y_train, "Regressão Linear (Treino)")
     
     print("\nAvaliando modelo no conjunto de teste:")
-    test_metrics = evaluate_model(y_test, y_pred_test, "Regressão Linear (Teste)")
+    test_metrics = model.evaluate(X_test, y_test, "Regressão Linear (Teste)")
     
-    # 8. Plotar resíduos
-    plot_residuals(y_test, y_pred_test, "Regressão Linear")
+    # 7. Plotar resíduos na escala log
+    y_pred_test = model.predict(X_test, transformed=True)
+    plot_residuals(np.log1p(y_test), y_pred_test, "Regressão Linear")
     
     print("\nProcesso concluído!")
 
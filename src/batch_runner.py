@@ -0,0 +1,334 @@
+"""
+Execução em lote do pipeline de regressão sobre vários conjuntos de dados.
+
+Descobre os diretórios com `train.csv`/`test.csv` (no formato de `data/raw`),
+roda pré-processamento -> treino -> avaliação -> submissão para cada conjunto,
+alvo e família de modelos em paralelo, respeitando um orçamento global de
+núcleos, e gera uma tabela consolidada com `compare_models`.
+
+Cada diretório pode ter um `dataset.json` opcional, por exemplo:
+    {"targets": ["SalePrice"], "id_column": "Id",
+     "train_file": "train.csv", "test_file": "test.csv"}
+
+Uso:
+    python -m src.batch_runner data/raw --targets SalePrice --n-jobs 8
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+from sklearn.tree import DecisionTreeRegressor
+
+from src.utils.data_processing import downcast_dtypes, preprocess_data, create_preprocessor
+from src.utils.evaluation import evaluate_model, compare_models
+from src.utils.folds import holdout_indices
+from src.utils.target_transform import TargetTransformRegressor
+
+MODEL_FAMILIES = ('linear_regression', 'decision_tree', 'random_forest', 'xgboost')
+
+
+def make_model(family: str, n_jobs: int = 1, random_state: int = 42):
+    """
+    Cria o regressor de uma família de modelos.
+
+    Args:
+        family: Nome da família (ver MODEL_FAMILIES)
+        n_jobs: Núcleos que o modelo pode usar
+        random_state: Semente para reprodutibilidade
+
+    Returns:
+        Estimador não treinado
+    """
+    if family == 'linear_regression':
+        return LinearRegression()
+    if family == 'decision_tree':
+        return DecisionTreeRegressor(max_depth=8, random_state=random_state)
+    if family == 'random_forest':
+        return RandomForestRegressor(n_estimators=300, n_jobs=n_jobs, random_state=random_state)
+    if family == 'xgboost':
+        from xgboost import XGBRegressor
+        return XGBRegressor(n_estimators=500, learning_rate=0.05, n_jobs=n_jobs,
+                            random_state=random_state)
+    raise ValueError(f"Família inválida. Use {', '.join(repr(f) for f in MODEL_FAMILIES)}.")
+
+
+def _file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Hash SHA-1 do conteúdo de um arquivo, lido em blocos."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def discover_datasets(roots: List[Path], default_targets: List[str]) -> List[dict]:
+    """
+    Procura diretórios com arquivo de treino e teste.
+
+    Args:
+        roots: Diretórios onde procurar (recursivamente)
+        default_targets: Alvos usados quando não há `dataset.json`
+
+    Returns:
+        Lista de conjuntos, cada um com nome, diretório, arquivos, alvos,
+        coluna de id e o hash do conteúdo de cada arquivo
+    """
+    datasets = []
+    digests = {}
+    for root in roots:
+        root = Path(root)
+        for config_dir in sorted({p.parent for p in root.rglob('*.csv')} | {root}):
+            config_file = config_dir / 'dataset.json'
+            config = json.loads(config_file.read_text()) if config_file.exists() else {}
+            train_file = config_dir / config.get('train_file', 'train.csv')
+            test_file = config_dir / config.get('test_file', 'test.csv')
+            if not (train_file.exists() and test_file.exists()):
+                continue
+
+            for path in (train_file, test_file):
+                if path not in digests:
+                    digests[path] = _file_digest(path)
+
+            datasets.append({
+                'name': str(config_dir.relative_to(root.parent)).replace(os.sep, '__'),
+                'dir': config_dir,
+                'train_file': train_file.name,
+                'test_file': test_file.name,
+                'targets': list(config.get('targets', default_targets)),
+                'id_column': config.get('id_column', 'Id'),
+                'train_digest': digests[train_file],
+                'test_digest': digests[test_file],
+            })
+    return datasets
+
+
+def _read_csv(path: Path, float32: bool) -> pd.DataFrame:
+    """Lê um CSV, reduzindo a precisão se pedido (ver `downcast_dtypes`)."""
+    df = pd.read_csv(path)
+    return downcast_dtypes(df) if float32 else df
+
+
+def _error_message(error: Exception) -> str:
+    """Resume uma exceção para a tabela consolidada."""
+    return f"{type(error).__name__}: {error}"
+
+
+def run_job(datasets: List[dict], families: List[str], output_dir: Path,
+            n_jobs: int = 1, float32: bool = False,
+            verbose: bool = False) -> Dict[str, Dict[str, dict]]:
+    """
+    Roda o pipeline completo para um grupo de conjuntos com o mesmo treino.
+
+    Os conjuntos do grupo compartilham o arquivo de treino (mesmo conteúdo),
+    os alvos declarados e a coluna de id. O treino é carregado e
+    pré-processado uma única vez, cada modelo é treinado uma vez por alvo e
+    as previsões são feitas uma vez por arquivo de teste distinto e gravadas
+    na pasta de cada conjunto. Nenhum alvo declarado entra como feature.
+
+    Args:
+        datasets: Conjuntos retornados por `discover_datasets` com o mesmo treino
+        families: Famílias de modelos a treinar
+        output_dir: Diretório das submissões
+        n_jobs: Núcleos disponíveis para cada modelo
+        float32: Se True, usa o modo de precisão reduzida
+        verbose: Se True, mostra as métricas de cada modelo
+
+    Returns:
+        Dicionário com as métricas de validação de cada alvo e família; uma
+        família que falha, ou um alvo ausente do treino, recebe {'erro': mensagem}
+    """
+    first = datasets[0]
+    id_column = first['id_column']
+    train_df = _read_csv(first['dir'] / first['train_file'], float32)
+    targets = [target for target in first['targets'] if target in train_df.columns]
+
+    # Alvos declarados que não existem no treino ficam registrados como erro
+    results = {
+        target: {family: {'erro': f"alvo ausente: {target}"} for family in families}
+        for target in first['targets'] if target not in train_df.columns
+    }
+    if not targets:
+        return results
+
+    train_df, numeric_features, categorical_features = preprocess_data(train_df)
+    excluded = set(first['targets']) | {id_column}
+    numeric_features = [col for col in numeric_features if col not in excluded]
+    categorical_features = [col for col in categorical_features if col not in excluded]
+    X = train_df[numeric_features + categorical_features]
+
+    test_frames = {}
+    for dataset in datasets:
+        if dataset['test_digest'] not in test_frames:
+            test_frames[dataset['test_digest']] = _read_csv(
+                dataset['dir'] / dataset['test_file'], float32
+            )
+
+    for target in targets:
+        y = train_df[target].to_numpy(dtype=np.float64)
+        train_idx, val_idx = holdout_indices(len(y))
+        metrics = results[target] = {}
+
+        for family in families:
+            try:
+                pipeline = Pipeline(steps=[
+                    ('preprocessor', create_preprocessor(
+                        numeric_features, categorical_features,
+                        dtype=np.float32 if float32 else np.float64)),
+                    ('regressor', make_model(family, n_jobs))
+                ])
+                # Alvos positivos são treinados na escala log, como nos notebooks
+                model = TargetTransformRegressor(pipeline, 'log1p') if y.min() > 0 else pipeline
+                model.fit(X.iloc[train_idx], y[train_idx])
+
+                output = io.StringIO()
+                with contextlib.redirect_stdout(sys.stdout if verbose else output):
+                    metrics[family] = evaluate_model(
+                        y[val_idx], model.predict(X.iloc[val_idx]),
+                        f"{family} ({first['name']} / {target})"
+                    )
+                predictions = {digest: model.predict(test_df)
+                               for digest, test_df in test_frames.items()}
+            except Exception as error:
+                metrics[family] = {'erro': _error_message(error)}
+                continue
+
+            for dataset in datasets:
+                test_df = test_frames[dataset['test_digest']]
+                ids = (test_df[id_column] if id_column in test_df.columns
+                       else pd.Series(test_df.index, name=id_column))
+                submission_dir = output_dir / dataset['name'] / target
+                submission_dir.mkdir(parents=True, exist_ok=True)
+                pd.DataFrame({id_column: ids, target: predictions[dataset['test_digest']]}).to_csv(
+                    submission_dir / f'submission_{family}.csv', index=False
+                )
+
+    return results
+
+
+def _run_job_safe(datasets: List[dict], families: List[str], *args) -> Dict[str, Dict[str, dict]]:
+    """Roda `run_job` e registra uma falha geral (ex: leitura) sem interromper o lote."""
+    try:
+        return run_job(datasets, families, *args)
+    except Exception as error:
+        failure = {'erro': _error_message(error)}
+        return {target: {family: failure for family in families}
+                for target in datasets[0]['targets']}
+
+
+def run_batch(roots: List[Path], targets: List[str], output_dir: Path,
+              families: Optional[List[str]] = None, n_jobs: int = -1,
+              threads_per_job: int = 1, float32: bool = False) -> pd.DataFrame:
+    """
+    Roda o pipeline para todos os conjuntos e alvos encontrados.
+
+    Conjuntos com o mesmo arquivo de treino (mesmo conteúdo), mesmos alvos e
+    mesma coluna de id formam um único job: o treino é lido, pré-processado e
+    usado para treinar os modelos uma vez, e só a previsão é repetida para
+    cada arquivo de teste distinto. Um job que falha é registrado na coluna
+    'erro' da tabela consolidada sem interromper os demais. O número de
+    processos simultâneos é o orçamento de núcleos dividido por
+    `threads_per_job`, que é o número de núcleos de cada modelo.
+
+    Args:
+        roots: Diretórios onde procurar os conjuntos
+        targets: Alvos usados quando o conjunto não tem `dataset.json`
+        output_dir: Diretório das submissões e da tabela consolidada
+        families: Famílias de modelos (padrão: todas)
+        n_jobs: Orçamento global de núcleos (-1 usa todos)
+        threads_per_job: Núcleos por modelo
+        float32: Se True, usa o modo de precisão reduzida
+
+    Returns:
+        DataFrame consolidado com as métricas de todos os modelos
+    """
+    families = list(families or MODEL_FAMILIES)
+    budget = os.cpu_count() if n_jobs == -1 else n_jobs
+    n_workers = max(budget // threads_per_job, 1)
+    output_dir = Path(output_dir)
+
+    start = time.perf_counter()
+    datasets = discover_datasets(roots, targets)
+
+    # Agrupar os conjuntos que compartilham o arquivo de treino
+    groups = {}
+    for dataset in datasets:
+        key = (dataset['train_digest'], tuple(dataset['targets']), dataset['id_column'])
+        groups.setdefault(key, []).append(dataset)
+    n_pairs = sum(len(dataset['targets']) for dataset in datasets)
+    n_fits = sum(len(group[0]['targets']) for group in groups.values())
+
+    print(f"\n{'='*60}")
+    print("EXECUÇÃO EM LOTE")
+    print(f"{'='*60}")
+    print(f"Conjuntos encontrados: {len(datasets)} ({n_pairs} pares conjunto/alvo, "
+          f"{len(groups)} arquivos de treino distintos, {n_fits} treinos)")
+    print(f"Processos simultâneos: {n_workers} x {threads_per_job} núcleo(s)")
+
+    results = Parallel(n_jobs=n_workers)(
+        delayed(_run_job_safe)(group, families, output_dir, threads_per_job, float32)
+        for group in groups.values()
+    )
+
+    metrics = {}
+    n_completed = 0
+    for group, group_results in zip(groups.values(), results):
+        completed = any('erro' not in values for target_metrics in group_results.values()
+                        for values in target_metrics.values())
+        n_completed += len(group) if completed else 0
+        for dataset in group:
+            for target, target_metrics in group_results.items():
+                for family, values in target_metrics.items():
+                    metrics[f"{dataset['name']} / {target} / {family}"] = values
+
+    elapsed = time.perf_counter() - start
+    comparison = compare_models(metrics) if metrics else pd.DataFrame()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    comparison.to_csv(output_dir / 'comparacao_modelos.csv')
+
+    n_failed = int(comparison['erro'].notna().sum()) if 'erro' in comparison else 0
+    print(f"\nTempo total: {elapsed:.1f}s")
+    # Só conjuntos com pelo menos um modelo avaliado contam na vazão
+    print(f"Vazão: {n_completed / elapsed * 3600:.1f} conjuntos/hora "
+          f"({n_completed} de {len(datasets)} conjuntos avaliados, {len(groups)} jobs executados)")
+    if n_failed:
+        print(f"Modelos com falha: {n_failed} (ver coluna 'erro')")
+    print(f"{'='*60}")
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('roots', nargs='+', type=Path,
+                        help="Diretórios onde procurar os conjuntos de dados")
+    parser.add_argument('--targets', nargs='+', default=['SalePrice'])
+    parser.add_argument('--models', nargs='+', default=list(MODEL_FAMILIES),
+                        choices=MODEL_FAMILIES)
+    parser.add_argument('--output-dir', type=Path, default=Path('outputs/batch'))
+    parser.add_argument('--n-jobs', type=int, default=-1,
+                        help="Orçamento global de núcleos (-1 usa todos)")
+    parser.add_argument('--threads-per-job', type=int, default=1)
+    parser.add_argument('--float32', action='store_true')
+    args = parser.parse_args(argv)
+
+    comparison = run_batch(args.roots, args.targets, args.output_dir, args.models,
+                           args.n_jobs, args.threads_per_job, args.float32)
+    print(comparison.to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,18 +3,50 @@ Módulo com funções utilitárias para o projeto de regressão.
 """
 
 from .data_processing import load_data, preprocess_data, create_preprocessor, split_data
+from .schema import DataSchema, SchemaValidationError, read_csv_validated
 from .evaluation import evaluate_model, plot_residuals
 from .eda import analisar_dados, analisar_valores_ausentes, plot_distribuicao_numerica, plot_correlacao
+from .folds import holdout_indices, make_fold_plan, save_fold_plan, load_fold_plan, iter_fold_arrays
+from .outliers import detect_outliers, outlier_masks, StreamingOutlierStats, OutlierClipper
+from .feature_selection import FeatureSelector, add_feature_selection
+from .drift import build_drift_reference, DriftMonitor
+from .profiling import enable_profiling, disable_profiling, profile_stage, profiled
+from .target_transform import TargetTransformRegressor
+from .stacking import make_folds, compute_oof_predictions, fit_meta_model
 
 __all__ = [
     'load_data',
     'preprocess_data',
     'create_preprocessor',
     'split_data',
+    'DataSchema',
+    'SchemaValidationError',
+    'read_csv_validated',
+    'detect_outliers',
+    'outlier_masks',
+    'StreamingOutlierStats',
+    'OutlierClipper',
+    'FeatureSelector',
+    'add_feature_selection',
+    'build_drift_reference',
+    'DriftMonitor',
+    'holdout_indices',
+    'make_fold_plan',
+    'save_fold_plan',
+    'load_fold_plan',
+    'iter_fold_arrays',
     'evaluate_model',
     'plot_residuals',
+    'TargetTransformRegressor',
+    'enable_profiling',
+    'disable_profiling',
+    'profile_stage',
+    'profiled',
     'analisar_dados',
     'analisar_valores_ausentes',
     'plot_distribuicao_numerica',
-    'plot_correlacao'
+    'plot_correlacao',
+    'make_folds',
+    'compute_oof_predictions',
+    'fit_meta_model'
 ]
\ No newline at end of file
@@ -7,16 +7,23 @@ Este módulo contém funções para carregar, limpar e transformar dados para mo
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Sequence
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, OneHotEncoder, LabelEncoder
+from sklearn.preprocessing import StandardScaler, RobustScaler, OneHotEncoder, LabelEncoder, FunctionTransformer
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 
+from .outliers import OutlierClipper, detect_outliers
+from .profiling import ProfiledStep, is_enabled, profiled
+from .schema import DataSchema, read_csv_validated
 
+
+@profiled()
 def load_data(data_path: Union[str, Path], train_file: str = 'train.csv', 
-             test_file: str = 'test.csv') -> tuple[pd.DataFrame, pd.DataFrame]:
+             test_file: str = 'test.csv',
+             downcast: bool = False,
+             schema: Optional[DataSchema] = None) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
     Carrega os dados de treino e teste.
     
@@ -24,18 +31,61 @@ def load_data(data_path: Union[str, Path], train_file: str = 'train.csv',
         data_path: Caminho para o diretório contendo os dados
         train_file: Nome do arquivo de treino
         test_file: Nome do arquivo de teste
+        downcast: Se True, reduz a precisão das colunas numéricas (ver `downcast_dtypes`)
+        schema: Se informado, valida cada bloco lido contra o esquema e
+               interrompe no primeiro erro (ver `schema.read_csv_validated`)
         
     Returns:
         Tupla contendo os DataFrames de treino e teste
     """
     data_path = Path(data_path)
-    train_df = pd.read_csv(data_path / train_file)
-    test_df = pd.read_csv(data_path / test_file)
+    if schema is not None:
+        train_df = read_csv_validated(data_path / train_file, schema)
+        test_df = read_csv_validated(data_path / test_file, schema)
+    else:
+        train_df = pd.read_csv(data_path / train_file)
+        test_df = pd.read_csv(data_path / test_file)
+    if downcast:
+        train_df = downcast_dtypes(train_df)
+        test_df = downcast_dtypes(test_df)
     return train_df, test_df
 
 
+@profiled()
+def downcast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduz a precisão das colunas numéricas para economizar memória.
+    
+    Colunas float passam para float32 e colunas inteiras de 64 bits para
+    int32 quando seus valores cabem nele. Tipos menores (int8/int16) não são
+    usados: operações entre colunas no pandas (ex: OverallQual * GrLivArea)
+    estourariam sem nenhum aviso.
+    
+    Args:
+        df: DataFrame de entrada
+        
+    Returns:
+        DataFrame com as colunas numéricas convertidas
+    """
+    df = df.copy()
+    
+    for col in df.select_dtypes(include=['float']).columns:
+        df[col] = df[col].astype(np.float32)
+    int32 = np.iinfo(np.int32)
+    for col in df.select_dtypes(include=['integer']).columns:
+        if df[col].dtype.itemsize > 4 and int32.min <= df[col].min() and df[col].max() <= int32.max:
+            df[col] = df[col].astype(np.int32)
+    
+    return df
+
+
+@profiled()
 def preprocess_data(df: pd.DataFrame, target_column: Optional[str] = None,
-                   drop_high_missing: bool = True, missing_threshold: float = 0.8) -> tuple[pd.DataFrame, list, list]:
+                   drop_high_missing: bool = True, missing_threshold: float = 0.8,
+                   outlier_columns: Optional[List[str]] = None,
+                   outlier_methods: Sequence[str] = ('iqr',),
+                   outlier_iqr_factor: float = 3.0,
+                   outlier_rule: str = 'any') -> tuple[pd.DataFrame, list, list]:
     """
     Realiza o pré-processamento inicial dos dados.
     
@@ -44,6 +94,22 @@ def preprocess_data(df: pd.DataFrame, target_column: Optional[str] = None,
         target_column: Nome da coluna alvo (opcional)
         drop_high_missing: Se True, remove colunas com muitos valores ausentes
         missing_threshold: Limiar para considerar colunas com muitos valores ausentes
+        outlier_columns: Se informado, remove as linhas com outliers nessas colunas,
+                        ver `outliers.detect_outliers`. No train.csv do House
+                        Prices, ['GrLivArea'] com os padrões remove 4 linhas: as
+                        casas acima de 4.000 pés², que o autor do conjunto
+                        recomenda excluir, incluindo as duas vendas grandes e
+                        baratas (Ids 524 e 1299). Não inclua o alvo: regras por
+                        coluna só marcam valores extremos em cada coluna e
+                        cortariam as casas mais caras, não as grandes e baratas
+        outlier_methods: Métodos de detecção ('iqr', 'mad' e/ou 'zscore'); todos
+                        precisam concordar para a célula ser outlier
+        outlier_iqr_factor: Multiplicador do IQR usado na detecção. O padrão
+                           (3.0) é mais folgado que o de `detect_outliers` (1.5,
+                           o limite de Tukey usado para inspecionar os dados)
+                           porque aqui as linhas são removidas do treino
+        outlier_rule: 'any' remove a linha quando alguma coluna indicada é
+                     outlier; 'all' só quando todas são
         
     Returns:
         Tuple contendo o DataFrame processado, lista de features numéricas e categóricas
@@ -51,7 +117,7 @@ def preprocess_data(df: pd.DataFrame, target_column: Optional[str] = None,
     df = df.copy()
     
     # Identificar colunas numéricas e categóricas
-    numeric_features = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+    numeric_features = df.select_dtypes(include=[np.number]).columns.tolist()
     categorical_features = df.select_dtypes(include=['object', 'category']).columns.tolist()
     
     # Remover a coluna alvo das features
@@ -70,13 +136,26 @@ def preprocess_data(df: pd.DataFrame, target_column: Optional[str] = None,
         numeric_features = [col for col in numeric_features if col in df.columns]
         categorical_features = [col for col in categorical_features if col in df.columns]
     
+    # Remover linhas com outliers nas colunas indicadas
+    if outlier_columns:
+        outlier_rows, _ = detect_outliers(
+            df, outlier_columns, methods=outlier_methods,
+            min_methods=len(outlier_methods), iqr_factor=outlier_iqr_factor,
+            row_rule=outlier_rule
+        )
+        df = df.loc[~outlier_rows]
+    
     return df, numeric_features, categorical_features
 
 
 def create_preprocessor(numeric_features: list, categorical_features: list,
                        numeric_strategy: str = 'median', 
                        categorical_strategy: str = 'most_frequent',
-                       scale_numeric: bool = True) -> ColumnTransformer:
+                       scale_numeric: bool = True,
+                       dtype: type = np.float64,
+                       scaler: str = 'standard',
+                       clip_outliers: bool = False,
+                       profile_steps: Optional[bool] = None) -> ColumnTransformer:
     """
     Cria um pré-processador para as features numéricas e categóricas.
     
@@ -86,25 +165,58 @@ def create_preprocessor(numeric_features: list, categorical_features: list,
         numeric_strategy: Estratégia para imputação de valores numéricos
         categorical_strategy: Estratégia para imputação de valores categóricos
         scale_numeric: Se True, aplica StandardScaler nas features numéricas
+        dtype: Tipo da matriz de saída, np.float64 ou np.float32. Com
+              np.float32, o imputer e o scaler trabalham em float32 e o one-hot
+              é gerado em uint8, reduzindo a memória pela metade
+        scaler: 'standard' (StandardScaler) ou 'robust' (RobustScaler, baseado
+               na mediana e no IQR, menos sensível a outliers)
+        clip_outliers: Se True, limita os valores numéricos aos limites do IQR
+                      aprendidos no treino antes da escala (ver `OutlierClipper`)
+        profile_steps: Se True, cada passo (imputer, scaler, one-hot...) é
+                      medido individualmente com `profiling.ProfiledStep`; o
+                      padrão segue `profiling.is_enabled()` no momento da criação
         
     Returns:
         ColumnTransformer configurado
     """
+    if scaler not in ('standard', 'robust'):
+        raise ValueError("Scaler inválido. Use 'standard' ou 'robust'.")
+    if np.dtype(dtype) not in (np.float32, np.float64):
+        raise ValueError("Tipo inválido. Use np.float32 ou np.float64.")
+    
+    reduced_precision = np.dtype(dtype) == np.float32
+    
     # Pipeline para features numéricas
     numeric_steps = [
         ('imputer', SimpleImputer(strategy=numeric_strategy))
     ]
     
-    if scale_numeric:
-        numeric_steps.append(('scaler', StandardScaler()))
+    if reduced_precision:
+        # Converter antes do imputer para que imputer e scaler preservem float32
+        numeric_steps.insert(0, ('cast', FunctionTransformer(
+            np.asarray, kw_args={'dtype': np.float32}, feature_names_out='one-to-one'
+        )))
     
-    numeric_transformer = Pipeline(steps=numeric_steps)
+    if clip_outliers:
+        numeric_steps.append(('clipper', OutlierClipper()))
+    
+    if scale_numeric:
+        numeric_steps.append(('scaler', StandardScaler() if scaler == 'standard' else RobustScaler()))
     
     # Pipeline para features categóricas
-    categorical_transformer = Pipeline(steps=[
+    categorical_steps = [
         ('imputer', SimpleImputer(strategy=categorical_strategy, fill_value='missing')),
-        ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
-    ])
+        ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False,
+                                 dtype=np.uint8 if reduced_precision else np.float64))
+    ]
+    
+    # Medir cada passo separadamente (ex: imputação x one-hot)
+    if is_enabled() if profile_steps is None else profile_steps:
+        numeric_steps = [(name, ProfiledStep(step, f'num.{name}')) for name, step in numeric_steps]
+        categorical_steps = [(name, ProfiledStep(step, f'cat.{name}')) for name, step in categorical_steps]
+    
+    numeric_transformer = Pipeline(steps=numeric_steps)
+    categorical_transformer = Pipeline(steps=categorical_steps)
     
     # Criar o ColumnTransformer
     preprocessor = ColumnTransformer(
@@ -118,6 +230,7 @@ def create_preprocessor(numeric_features: list, categorical_features: list,
     return preprocessor
 
 
+@profiled()
 def split_data(X: pd.DataFrame, y: pd.Series, test_size: float = 0.2, 
               random_state: int = 42, stratify: Optional[np.ndarray] = None) -> tuple:
     """
@@ -133,6 +246,8 @@ def split_data(X: pd.DataFrame, y: pd.Series, test_size: float = 0.2,
         
     Returns:
         Tuple com X_train, X_test, y_train, y_test
+        
+    Para obter apenas os índices, sem copiar X e y, use `folds.holdout_indices`.
     """
     return train_test_split(
         X, y, 
@@ -142,6 +257,7 @@ def split_data(X: pd.DataFrame, y: pd.Series, test_size: float = 0.2,
     )
 
 
+@profiled()
 def preencher_valores_numericos(df: pd.DataFrame, colunas: List[str] = None, 
                               estrategia: str = 'mediana', 
                               valor_constante: float = 0) -> pd.DataFrame:
@@ -182,6 +298,7 @@ def preencher_valores_numericos(df: pd.DataFrame, colunas: List[str] = None,
     return df
 
 
+@profiled()
 def converter_categorias(df: pd.DataFrame, colunas: List[str] = None, 
                         metodo: str = 'onehot',
                         drop_first: bool = True) -> pd.DataFrame:
@@ -0,0 +1,322 @@
+"""
+Módulo para monitoramento de drift entre treino e dados de previsão.
+
+As distribuições de referência (histogramas por quantis das features numéricas
+e frequências do vocabulário das categóricas) são calculadas uma única vez no
+treino e guardadas no próprio pré-processador, em `drift_reference_`, de modo
+que são salvas junto com o `*_preprocessor.joblib`. Na previsão, o
+`DriftMonitor` acumula contagens lote a lote e calcula PSI, distância KS entre
+os histogramas numéricos, distância de variação total entre as frequências
+categóricas (que, ao contrário do KS, não depende da ordem das categorias),
+taxa de categorias não vistas e deslocamento da média em relação às
+estatísticas do scaler.
+"""
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+
+from .profiling import profiled
+
+EPSILON = 1e-6
+
+
+def _feature_groups(preprocessor: ColumnTransformer) -> tuple:
+    """Extrai colunas numéricas, categóricas e os passos ajustados de cada grupo."""
+    # Pré-processador com seleção de features (ver `add_feature_selection`)
+    if isinstance(preprocessor, Pipeline):
+        preprocessor = preprocessor.steps[0][1]
+    numeric, categorical = ([], None), ([], None)
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == 'num':
+            numeric = (list(columns), transformer)
+        elif name == 'cat':
+            categorical = (list(columns), transformer)
+    return numeric, categorical
+
+
+def _bin_numeric(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Conta quantos valores de cada coluna caem em cada faixa.
+
+    A última faixa de cada coluna guarda os valores ausentes.
+    """
+    n_cols, n_edges = edges.shape
+    n_bins = n_edges + 2
+    idx = np.empty(values.shape, dtype=np.int64)
+    for j in range(n_cols):
+        idx[:, j] = np.searchsorted(edges[j], values[:, j], side='right')
+    idx[np.isnan(values)] = n_bins - 1
+    offsets = np.arange(n_cols) * n_bins
+    return np.bincount((idx + offsets).ravel(), minlength=n_cols * n_bins).reshape(n_cols, n_bins)
+
+
+def _count_categories(df: pd.DataFrame, columns: list, vocabularies: list) -> list:
+    """
+    Conta as ocorrências de cada categoria do vocabulário por coluna.
+
+    Cada array tem len(vocabulário) + 2 posições: as categorias conhecidas, as
+    não vistas no treino e os valores ausentes.
+    """
+    counts = []
+    for col, vocab in zip(columns, vocabularies):
+        values = df[col]
+        codes = pd.Categorical(values, categories=vocab).codes.astype(np.int64)
+        missing = values.isna().to_numpy()
+        codes[codes < 0] = len(vocab)
+        codes[missing] = len(vocab) + 1
+        counts.append(np.bincount(codes, minlength=len(vocab) + 2))
+    return counts
+
+
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Population Stability Index entre duas distribuições de contagens."""
+    p = expected / max(expected.sum(), 1) + EPSILON
+    q = actual / max(actual.sum(), 1) + EPSILON
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def _ks(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Maior distância entre as distribuições acumuladas dos histogramas."""
+    p = np.cumsum(expected) / max(expected.sum(), 1)
+    q = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.max(np.abs(p - q)))
+
+
+def _tvd(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Distância de variação total (0.5 * soma |p - q|) entre duas distribuições."""
+    p = expected / max(expected.sum(), 1)
+    q = actual / max(actual.sum(), 1)
+    return float(0.5 * np.sum(np.abs(p - q)))
+
+
+@profiled()
+def build_drift_reference(preprocessor: ColumnTransformer, X_train: pd.DataFrame,
+                          n_bins: int = 10, exclude: Sequence[str] = ('Id',)) -> dict:
+    """
+    Calcula as distribuições de referência e as anexa ao pré-processador.
+
+    Deve ser chamada logo após o `fit` do pré-processador, com os mesmos dados
+    de treino. O resultado fica em `preprocessor.drift_reference_`.
+
+    Args:
+        preprocessor: ColumnTransformer já ajustado (ver `create_preprocessor`),
+                     com ou sem `add_feature_selection`
+        X_train: Dados de treino usados no ajuste
+        n_bins: Número de faixas por quantis das features numéricas
+        exclude: Colunas ignoradas, como identificadores, que mudam de faixa
+                entre treino e teste por construção
+
+    Returns:
+        Dicionário com a referência de cada grupo de features
+    """
+    (num_all, num_pipeline), (cat_all, cat_pipeline) = _feature_groups(preprocessor)
+    num_keep = [i for i, col in enumerate(num_all) if col not in exclude]
+    cat_keep = [i for i, col in enumerate(cat_all) if col not in exclude]
+    num_cols = [num_all[i] for i in num_keep]
+    cat_cols = [cat_all[i] for i in cat_keep]
+
+    values = X_train[num_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    edges = np.full((len(num_cols), n_bins - 1), np.inf)
+    if num_cols:
+        quantiles = np.nanquantile(values, np.linspace(0, 1, n_bins + 1)[1:-1], axis=0).T
+        for i, row in enumerate(quantiles):
+            unique = np.unique(row[~np.isnan(row)])
+            edges[i, :len(unique)] = unique
+
+    # Estatísticas do scaler ajustado, quando houver (StandardScaler)
+    center = scale = None
+    scaler = num_pipeline.named_steps.get('scaler') if num_pipeline is not None else None
+    if scaler is not None and hasattr(scaler, 'mean_'):
+        center, scale = scaler.mean_[num_keep], scaler.scale_[num_keep]
+
+    vocabularies = []
+    if cat_pipeline is not None:
+        categories = cat_pipeline.named_steps['onehot'].categories_
+        vocabularies = [list(categories[i]) for i in cat_keep]
+
+    reference = {
+        'numeric_features': num_cols,
+        'edges': edges,
+        'numeric_counts': _bin_numeric(values, edges),
+        'center': center,
+        'scale': scale,
+        'categorical_features': cat_cols,
+        'vocabularies': vocabularies,
+        'categorical_counts': _count_categories(X_train, cat_cols, vocabularies),
+        'excluded': [col for col in num_all + cat_all if col in exclude],
+    }
+    preprocessor.drift_reference_ = reference
+    return reference
+
+
+class DriftMonitor:
+    """
+    Acumula estatísticas dos dados de previsão e compara com a referência de treino.
+
+    Args:
+        reference: Pré-processador com `drift_reference_` ou o dicionário
+                  retornado por `build_drift_reference`
+        psi_threshold: PSI acima do qual a feature gera alerta
+        ks_threshold: Distância KS acima da qual a feature numérica gera alerta
+        tvd_threshold: Distância de variação total acima da qual a feature
+                      categórica gera alerta
+        unseen_threshold: Taxa de categorias não vistas que gera alerta
+        exclude: Colunas omitidas do relatório (útil com referências antigas
+                que ainda incluem o identificador)
+
+    Exemplo:
+        monitor = DriftMonitor(joblib.load('outputs/models/xgboost_preprocessor.joblib'))
+        for chunk in monitor.observe(pd.read_csv('test.csv', chunksize=50_000)):
+            y_pred = model.predict(chunk)
+        monitor.save_report('outputs/drift_report.json')
+    """
+
+    def __init__(self, reference, psi_threshold: float = 0.2,
+                 ks_threshold: float = 0.1, tvd_threshold: float = 0.1,
+                 unseen_threshold: float = 0.01,
+                 exclude: Sequence[str] = ('Id',)):
+        if not isinstance(reference, dict):
+            if not hasattr(reference, 'drift_reference_'):
+                raise ValueError(
+                    "O pré-processador não tem referência de drift. "
+                    "Use build_drift_reference após o fit."
+                )
+            reference = reference.drift_reference_
+        self.reference = reference
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.tvd_threshold = tvd_threshold
+        self.unseen_threshold = unseen_threshold
+        self.exclude = tuple(exclude)
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta as contagens acumuladas."""
+        ref = self.reference
+        self.n_rows = 0
+        self.numeric_counts = np.zeros_like(ref['numeric_counts'])
+        self.numeric_sum = np.zeros(len(ref['numeric_features']))
+        self.numeric_present = np.zeros(len(ref['numeric_features']))
+        self.categorical_counts = [np.zeros_like(c) for c in ref['categorical_counts']]
+
+    def update(self, batch: pd.DataFrame) -> 'DriftMonitor':
+        """
+        Acrescenta um lote de dados de previsão às contagens.
+
+        Args:
+            batch: DataFrame com as colunas usadas no treino
+
+        Returns:
+            O próprio objeto
+        """
+        ref = self.reference
+        values = batch[ref['numeric_features']].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        self.numeric_counts += _bin_numeric(values, ref['edges'])
+        self.numeric_sum += np.where(present, values, 0.0).sum(axis=0)
+        self.numeric_present += present.sum(axis=0)
+
+        batch_counts = _count_categories(batch, ref['categorical_features'], ref['vocabularies'])
+        for total, counts in zip(self.categorical_counts, batch_counts):
+            total += counts
+
+        self.n_rows += len(batch)
+        return self
+
+    def observe(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Atualiza o monitor com cada bloco e o repassa adiante, sem alterá-lo.
+
+        Args:
+            chunks: Iterável de DataFrames (ex: `pd.read_csv(chunksize=...)`)
+
+        Yields:
+            Os mesmos blocos recebidos
+        """
+        for chunk in chunks:
+            self.update(chunk)
+            yield chunk
+
+    def report(self) -> pd.DataFrame:
+        """
+        Calcula as métricas de drift por feature.
+
+        Returns:
+            DataFrame com tipo, PSI, KS (numéricas), variação total
+            (categóricas), taxa de ausentes (treino e previsão),
+            taxa de categorias não vistas, deslocamento da média em desvios
+            padrão do treino e indicação de alerta
+        """
+        ref = self.reference
+        rows = []
+
+        for i, col in enumerate(ref['numeric_features']):
+            expected, actual = ref['numeric_counts'][i], self.numeric_counts[i]
+            shift = np.nan
+            if ref['center'] is not None and self.numeric_present[i] > 0:
+                mean = self.numeric_sum[i] / self.numeric_present[i]
+                shift = (mean - ref['center'][i]) / ref['scale'][i]
+            rows.append({
+                'feature': col, 'tipo': 'numerica',
+                'psi': _psi(expected, actual), 'ks': _ks(expected[:-1], actual[:-1]),
+                'tvd': np.nan,
+                'ausentes_treino': expected[-1] / max(expected.sum(), 1),
+                'ausentes_previsao': actual[-1] / max(actual.sum(), 1),
+                'nao_vistas': 0.0, 'desvio_media': shift,
+            })
+
+        for col, expected, actual in zip(ref['categorical_features'],
+                                         ref['categorical_counts'], self.categorical_counts):
+            rows.append({
+                'feature': col, 'tipo': 'categorica',
+                'psi': _psi(expected, actual), 'ks': np.nan,
+                'tvd': _tvd(expected[:-1], actual[:-1]),
+                'ausentes_treino': expected[-1] / max(expected.sum(), 1),
+                'ausentes_previsao': actual[-1] / max(actual.sum(), 1),
+                'nao_vistas': actual[-2] / max(actual.sum(), 1), 'desvio_media': np.nan,
+            })
+
+        report = pd.DataFrame(rows)
+        if not report.empty:
+            report = report[~report['feature'].isin(self.exclude)]
+        if report.empty:
+            return report
+        report['alerta'] = (
+            (report['psi'] > self.psi_threshold)
+            | (report['ks'] > self.ks_threshold)
+            | (report['tvd'] > self.tvd_threshold)
+            | (report['nao_vistas'] > self.unseen_threshold)
+        )
+        return report.sort_values('psi', ascending=False).reset_index(drop=True)
+
+    def save_report(self, path: Union[str, Path]) -> dict:
+        """
+        Salva o relatório estruturado (resumo, alertas e métricas) em JSON.
+
+        Args:
+            path: Caminho do arquivo de saída
+
+        Returns:
+            Dicionário salvo
+        """
+        report = self.report()
+        alerts = report[report['alerta']] if not report.empty else report
+        content = {
+            'linhas_monitoradas': int(self.n_rows),
+            'limiares': {'psi': self.psi_threshold, 'ks': self.ks_threshold,
+                         'tvd': self.tvd_threshold, 'nao_vistas': self.unseen_threshold},
+            'total_alertas': int(len(alerts)),
+            'alertas': json.loads(alerts.to_json(orient='records')),
+            'features': json.loads(report.to_json(orient='records')),
+        }
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(content, indent=2, ensure_ascii=False))
+        return content
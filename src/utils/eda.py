@@ -11,7 +11,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 
+from .profiling import profiled
 
+
+@profiled()
 def analisar_dados(df: pd.DataFrame, mostrar_amostra: bool = True) -> None:
     """
     Exibe informações básicas sobre o DataFrame.
@@ -35,6 +38,7 @@ def analisar_dados(df: pd.DataFrame, mostrar_amostra: bool = True) -> None:
     print(f"\n{'='*50}")
 
 
+@profiled()
 def analisar_valores_ausentes(
     df: pd.DataFrame, 
     limite_porcentagem: float = 30.0,
@@ -144,6 +148,7 @@ def analisar_valores_ausentes(
     return missing_data
 
 
+@profiled()
 def plot_distribuicao_numerica(df: pd.DataFrame, colunas: list = None) -> None:
     """
     Plota a distribuição de variáveis numéricas.
@@ -170,6 +175,7 @@ def plot_distribuicao_numerica(df: pd.DataFrame, colunas: list = None) -> None:
     plt.show()
 
 
+@profiled()
 def plot_correlacao(df: pd.DataFrame, metodo: str = 'pearson', 
                    tamanho_figura: tuple = (12, 10)) -> None:
     """
@@ -7,7 +7,10 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 
+from .profiling import profiled
 
+
+@profiled()
 def evaluate_model(y_true: np.ndarray, y_pred: np.ndarray, model_name: str = 'Modelo') -> dict:
     """
     Avalia um modelo de regressão com várias métricas.
@@ -43,6 +46,7 @@ def evaluate_model(y_true: np.ndarray, y_pred: np.ndarray, model_name: str = 'Mo
     return metrics
 
 
+@profiled()
 def plot_residuals(y_true: np.ndarray, y_pred: np.ndarray, model_name: str = 'Modelo') -> None:
     """
     Plota os resíduos de um modelo de regressão.
@@ -89,6 +93,7 @@ def compare_models(metrics_dict: dict) -> pd.DataFrame:
     return pd.DataFrame(metrics_dict).T
 
 
+@profiled()
 def plot_feature_importance(model, feature_names: list, top_n: int = 20) -> None:
     """
     Plota as features mais importantes de um modelo.
@@ -0,0 +1,161 @@
+"""
+Módulo para seleção de features após o pré-processamento.
+
+Remove features quase constantes e features altamente correlacionadas (como
+GarageCars/GarageArea), com a matriz de correlação calculada em blocos e em
+float32 para escalar a milhares de colunas, e opcionalmente poda pelas
+importâncias de um modelo barato. O seletor entra como último passo do
+pré-processador, de modo que as colunas escolhidas são salvas junto com ele.
+"""
+
+from typing import Optional
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+
+
+def correlated_pairs(X: np.ndarray, threshold: float = 0.95,
+                     block_size: int = 512) -> np.ndarray:
+    """
+    Encontra os pares de colunas com correlação absoluta acima do limiar.
+
+    As colunas são padronizadas em float32 e a correlação é calculada bloco a
+    bloco (Z_i.T @ Z_j / n), apenas no triângulo superior, sem montar a matriz
+    completa de correlação.
+
+    Args:
+        X: Matriz de features (linhas x colunas) sem colunas constantes
+        threshold: Correlação absoluta mínima para reportar o par
+        block_size: Número de colunas por bloco
+
+    Returns:
+        Array (n_pares x 2) com os índices (i, j), i < j, de cada par
+    """
+    Z = np.array(X, dtype=np.float32)
+    Z -= Z.mean(axis=0)
+    Z /= Z.std(axis=0)
+    n_rows, n_cols = Z.shape
+
+    pairs = []
+    for start_i in range(0, n_cols, block_size):
+        stop_i = min(start_i + block_size, n_cols)
+        block_i = Z[:, start_i:stop_i]
+        for start_j in range(start_i, n_cols, block_size):
+            stop_j = min(start_j + block_size, n_cols)
+            corr = block_i.T @ Z[:, start_j:stop_j]
+            corr /= n_rows
+            high = np.abs(corr) > threshold
+            if start_i == start_j:
+                high = np.triu(high, k=1)
+            ii, jj = np.nonzero(high)
+            if len(ii):
+                pairs.append(np.column_stack([ii + start_i, jj + start_j]))
+
+    return np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+
+
+class FeatureSelector(BaseEstimator, TransformerMixin):
+    """
+    Seleciona features removendo as quase constantes, as redundantes e, opcionalmente,
+    as de menor importância.
+
+    Args:
+        max_dominant_share: Proporção máxima de linhas com o valor mais frequente;
+                           acima dela a feature é considerada quase constante
+        corr_threshold: Correlação absoluta acima da qual uma feature do par é
+                       removida (mantém a que aparece primeiro); None desliga
+        block_size: Número de colunas por bloco no cálculo da correlação
+        importance_estimator: Modelo com `feature_importances_` usado na poda
+                             (ex: DecisionTreeRegressor(max_depth=8)); None desliga
+        importance_coverage: Fração da importância total mantida na poda
+
+    Atributos após o fit:
+        support_: Máscara booleana das features mantidas
+        report_: Quantas features cada critério removeu
+    """
+
+    def __init__(self, max_dominant_share: float = 0.995, corr_threshold: Optional[float] = 0.95,
+                 block_size: int = 512, importance_estimator=None,
+                 importance_coverage: float = 0.99):
+        self.max_dominant_share = max_dominant_share
+        self.corr_threshold = corr_threshold
+        self.block_size = block_size
+        self.importance_estimator = importance_estimator
+        self.importance_coverage = importance_coverage
+
+    def fit(self, X, y=None):
+        X = np.asarray(X)
+        n_features = X.shape[1]
+        support = np.ones(n_features, dtype=bool)
+
+        # Quase constantes: se o valor dominante ocupa mais da metade das linhas,
+        # ele é a mediana, então basta contar os valores iguais à mediana
+        dominant_share = np.mean(X == np.median(X, axis=0), axis=0)
+        support &= dominant_share <= self.max_dominant_share
+        support &= np.std(X, axis=0) > 0
+        n_constant = n_features - int(support.sum())
+
+        n_correlated = 0
+        if self.corr_threshold is not None and support.sum() > 1:
+            kept = np.flatnonzero(support)
+            pairs = correlated_pairs(X[:, kept], self.corr_threshold, self.block_size)
+            dropped = np.zeros(len(kept), dtype=bool)
+            for i, j in pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]:
+                if not dropped[i]:
+                    dropped[j] = True
+            support[kept[dropped]] = False
+            n_correlated = int(dropped.sum())
+
+        n_importance = 0
+        if self.importance_estimator is not None:
+            if y is None:
+                raise ValueError("A poda por importância exige o alvo y.")
+            kept = np.flatnonzero(support)
+            estimator = clone(self.importance_estimator).fit(X[:, kept], y)
+            importances = estimator.feature_importances_
+            order = np.argsort(importances)[::-1]
+            coverage = np.cumsum(importances[order]) / max(importances.sum(), 1e-12)
+            n_keep = int(np.searchsorted(coverage, self.importance_coverage) + 1)
+            dropped = np.ones(len(kept), dtype=bool)
+            dropped[order[:n_keep]] = False
+            support[kept[dropped]] = False
+            n_importance = int(dropped.sum())
+
+        self.support_ = support
+        self.n_features_in_ = n_features
+        self.report_ = {
+            'features_in': n_features,
+            'quase_constantes': n_constant,
+            'correlacionadas': n_correlated,
+            'baixa_importancia': n_importance,
+            'features_out': int(support.sum()),
+        }
+        return self
+
+    def transform(self, X):
+        return np.asarray(X)[:, self.support_]
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is None:
+            input_features = [f'x{i}' for i in range(self.n_features_in_)]
+        return np.asarray(input_features, dtype=object)[self.support_]
+
+
+def add_feature_selection(preprocessor: ColumnTransformer, **selector_params) -> Pipeline:
+    """
+    Acrescenta o `FeatureSelector` como último passo do pré-processador.
+
+    Args:
+        preprocessor: ColumnTransformer criado por `create_preprocessor`
+        **selector_params: Parâmetros repassados ao `FeatureSelector`
+
+    Returns:
+        Pipeline (colunas -> seleção) que pode ser salvo com joblib como o
+        pré-processador original
+    """
+    return Pipeline(steps=[
+        ('columns', preprocessor),
+        ('selector', FeatureSelector(**selector_params))
+    ])
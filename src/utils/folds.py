@@ -0,0 +1,248 @@
+"""
+Módulo para planejamento de divisões e folds por índices.
+
+Este módulo gera apenas arrays de índices inteiros (holdout, K-fold, K-fold
+repetido, estratificado pelo alvo discretizado ou agrupado por uma coluna como
+Neighborhood), que podem ser salvos em disco para que todas as famílias de
+modelos usem exatamente os mesmos folds. Os planos são listas de tuplas
+(treino, validação) e podem ser passados diretamente no parâmetro `cv` de
+`cross_val_score` e `GridSearchCV`.
+"""
+
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from sklearn.model_selection import (
+    GroupKFold, KFold, RepeatedKFold, RepeatedStratifiedKFold,
+    StratifiedKFold, train_test_split
+)
+
+FoldPlan = List[Tuple[np.ndarray, np.ndarray]]
+
+SCHEMES = ('kfold', 'repeated', 'stratified', 'group')
+
+
+def bin_target(y: np.ndarray, n_bins: int = 10) -> np.ndarray:
+    """
+    Discretiza um alvo contínuo em faixas de quantis para estratificação.
+
+    Args:
+        y: Variável alvo
+        n_bins: Número de faixas
+
+    Returns:
+        Array com o código da faixa de cada linha
+    """
+    y = np.asarray(y)
+    edges = np.quantile(y, np.linspace(0, 1, n_bins + 1)[1:-1])
+    return np.searchsorted(edges, y, side='right')
+
+
+def holdout_indices(n_samples: int, test_size: float = 0.2, random_state: int = 42,
+                    y: Optional[np.ndarray] = None,
+                    n_bins: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Divide as linhas em treino e teste retornando apenas índices.
+
+    Args:
+        n_samples: Número de linhas
+        test_size: Proporção do conjunto de teste (entre 0 e 1)
+        random_state: Semente para reprodutibilidade
+        y: Se informado, estratifica pelo alvo discretizado em `n_bins` faixas
+        n_bins: Número de faixas usadas na estratificação
+
+    Returns:
+        Tupla com os índices de treino e de teste
+    """
+    stratify = bin_target(y, n_bins) if y is not None else None
+    train_idx, test_idx = train_test_split(
+        np.arange(n_samples), test_size=test_size,
+        random_state=random_state, stratify=stratify
+    )
+    return np.sort(train_idx), np.sort(test_idx)
+
+
+def make_fold_plan(n_samples: int, scheme: str = 'kfold', n_splits: int = 5,
+                   n_repeats: Optional[int] = None, random_state: int = 42,
+                   y: Optional[np.ndarray] = None, n_bins: int = 10,
+                   groups: Optional[np.ndarray] = None) -> FoldPlan:
+    """
+    Gera um plano de folds com índices de treino e validação.
+
+    Args:
+        n_samples: Número de linhas
+        scheme: 'kfold', 'repeated', 'stratified' (pelo alvo discretizado;
+               repetido se `n_repeats` > 1) ou 'group' (ex: Neighborhood)
+        n_splits: Número de folds
+        n_repeats: Número de repetições (padrão: 3 para 'repeated' e 1 para 'stratified')
+        random_state: Semente para reprodutibilidade
+        y: Variável alvo (obrigatória para 'stratified')
+        n_bins: Número de faixas do alvo para 'stratified'
+        groups: Rótulo de grupo de cada linha (obrigatório para 'group')
+
+    Returns:
+        Lista de tuplas (índices de treino, índices de validação)
+    """
+    index = np.arange(n_samples)
+
+    if scheme == 'kfold':
+        splitter = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        return list(splitter.split(index))
+    if scheme == 'repeated':
+        splitter = RepeatedKFold(n_splits=n_splits, n_repeats=n_repeats or 3,
+                                 random_state=random_state)
+        return list(splitter.split(index))
+    if scheme == 'stratified':
+        if y is None:
+            raise ValueError("O esquema 'stratified' exige o alvo y.")
+        if n_repeats and n_repeats > 1:
+            splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats,
+                                               random_state=random_state)
+        else:
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=True,
+                                       random_state=random_state)
+        return list(splitter.split(index, bin_target(y, n_bins)))
+    if scheme == 'group':
+        if groups is None:
+            raise ValueError("O esquema 'group' exige os grupos (ex: df['Neighborhood']).")
+        return list(GroupKFold(n_splits=n_splits).split(index, groups=np.asarray(groups)))
+
+    raise ValueError(f"Esquema inválido. Use {', '.join(repr(s) for s in SCHEMES)}.")
+
+
+def save_fold_plan(folds: FoldPlan, path: Union[str, Path]) -> Path:
+    """
+    Salva um plano de folds em um arquivo .npz.
+
+    Args:
+        folds: Plano de folds
+        path: Caminho do arquivo de saída
+
+    Returns:
+        Caminho do arquivo salvo
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {}
+    for i, (train_idx, val_idx) in enumerate(folds):
+        arrays[f'train_{i}'] = train_idx
+        arrays[f'val_{i}'] = val_idx
+    np.savez(path, n_folds=len(folds), **arrays)
+    return path
+
+
+def load_fold_plan(path: Union[str, Path]) -> FoldPlan:
+    """
+    Carrega um plano de folds salvo com `save_fold_plan`.
+
+    Args:
+        path: Caminho do arquivo .npz
+
+    Returns:
+        Lista de tuplas (índices de treino, índices de validação)
+    """
+    with np.load(path) as data:
+        return [(data[f'train_{i}'], data[f'val_{i}']) for i in range(int(data['n_folds']))]
+
+
+def _as_slice(idx: np.ndarray) -> Optional[slice]:
+    """Retorna um slice equivalente se os índices formam um intervalo contínuo."""
+    if len(idx) == 0:
+        return slice(0, 0)
+    start, stop = int(idx[0]), int(idx[-1]) + 1
+    if stop - start == len(idx) and np.array_equal(idx, np.arange(start, stop)):
+        return slice(start, stop)
+    return None
+
+
+def _check_bounds(idx: np.ndarray, n_rows: int) -> None:
+    """Garante que todos os índices estão em [0, n_rows)."""
+    if len(idx) and (idx.min() < 0 or idx.max() >= n_rows):
+        raise ValueError(
+            f"Índices fora do intervalo [0, {n_rows}): mínimo {int(idx.min())}, "
+            f"máximo {int(idx.max())}. O plano de folds foi gerado para outro "
+            "conjunto de dados?"
+        )
+
+
+def take_rows(X: np.ndarray, idx: np.ndarray, out: Optional[np.ndarray] = None,
+              check_bounds: bool = True) -> np.ndarray:
+    """
+    Seleciona linhas de um array sem copiar quando possível.
+
+    Se os índices formam um intervalo contínuo, retorna uma view. Caso
+    contrário, copia as linhas para `out` (se informado) em vez de alocar um
+    novo array.
+
+    Args:
+        X: Array de origem
+        idx: Índices das linhas
+        out: Array de destino reaproveitável, com pelo menos len(idx) linhas
+        check_bounds: Se True, verifica se os índices estão dentro de X; use
+                     False apenas quando o plano já foi verificado
+
+    Returns:
+        View ou array com as linhas selecionadas
+
+    Raises:
+        ValueError: Se algum índice for negativo ou maior que o número de linhas
+    """
+    if check_bounds:
+        _check_bounds(idx, len(X))
+    rows = _as_slice(idx)
+    if rows is not None:
+        return X[rows]
+    if out is None:
+        return X[idx]
+    # mode='clip' evita o buffer intermediário que o numpy usa com mode='raise';
+    # os limites já foram verificados, então nenhum índice é de fato cortado
+    return np.take(X, idx, axis=0, out=out[:len(idx)], mode='clip')
+
+
+def iter_fold_arrays(X: np.ndarray, y: np.ndarray, folds: FoldPlan,
+                     reuse_buffers: bool = False) -> Iterator[Tuple[np.ndarray, ...]]:
+    """
+    Percorre os folds sobre uma única matriz pré-processada.
+
+    Blocos contínuos viram views de X. Os demais são copiados para arrays
+    novos a cada fold, que podem ser guardados com segurança (ex: um modelo
+    por fold, inclusive estimadores que mantêm uma referência a X, como
+    KNeighborsRegressor).
+
+    Com `reuse_buffers=True`, as cópias vão para dois buffers alocados uma
+    única vez e sobrescritos a cada fold, economizando alocações. Nesse modo
+    os arrays de um fold só são válidos até o próximo passo da iteração: o
+    modelo deve ser treinado e avaliado antes de avançar e não pode guardar
+    referência aos dados de treino.
+
+    Args:
+        X: Matriz de features pré-processada (numpy)
+        y: Variável alvo
+        folds: Plano de folds
+        reuse_buffers: Se True, reaproveita os mesmos buffers entre os folds
+
+    Yields:
+        Tupla (X_train, y_train, X_val, y_val) de cada fold
+
+    Raises:
+        ValueError: Se algum índice do plano estiver fora de X (ex: plano salvo
+                   para um conjunto de outro tamanho)
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    # Verificação única do plano; take_rows pode então usar mode='clip' sem risco
+    for train_idx, val_idx in folds:
+        _check_bounds(train_idx, len(X))
+        _check_bounds(val_idx, len(X))
+
+    train_buffer = val_buffer = None
+    if reuse_buffers:
+        max_train = max(len(train_idx) for train_idx, _ in folds)
+        max_val = max(len(val_idx) for _, val_idx in folds)
+        train_buffer = np.empty((max_train,) + X.shape[1:], dtype=X.dtype)
+        val_buffer = np.empty((max_val,) + X.shape[1:], dtype=X.dtype)
+
+    for train_idx, val_idx in folds:
+        yield (take_rows(X, train_idx, train_buffer, check_bounds=False), y[train_idx],
+               take_rows(X, val_idx, val_buffer, check_bounds=False), y[val_idx])
@@ -0,0 +1,315 @@
+"""
+Módulo para detecção e tratamento de outliers.
+
+Este módulo calcula máscaras de outliers por IQR, MAD e z-score para todas as
+colunas numéricas de uma vez (operações vetorizadas por coluna, sem laços em
+Python), oferece o Isolation Forest como score opcional, estimativas de
+quantis em fluxo para dados grandes e um transformador que limita (clip) os
+valores extremos dentro do `create_preprocessor`.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.ensemble import IsolationForest
+
+from .profiling import profiled
+
+METHODS = ('iqr', 'mad', 'zscore')
+
+# Fator que torna o MAD comparável ao desvio padrão em dados normais
+MAD_SCALE = 1.4826
+
+
+def _column_stats(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Calcula quartis, mediana, MAD, média e desvio de cada coluna."""
+    q1, median, q3 = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0)
+    mad = np.nanmedian(np.abs(values - median), axis=0)
+    return {
+        'q1': q1, 'q3': q3, 'median': median, 'mad': mad,
+        'mean': np.nanmean(values, axis=0), 'std': np.nanstd(values, axis=0),
+    }
+
+
+def _masks_from_stats(values: np.ndarray, stats: Dict[str, np.ndarray],
+                      methods: Sequence[str], iqr_factor: float,
+                      mad_threshold: float, z_threshold: float) -> Dict[str, np.ndarray]:
+    """Aplica os limiares de cada método; valores ausentes nunca são outliers."""
+    masks = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if 'iqr' in methods:
+            iqr = stats['q3'] - stats['q1']
+            lower = stats['q1'] - iqr_factor * iqr
+            upper = stats['q3'] + iqr_factor * iqr
+            masks['iqr'] = (values < lower) | (values > upper)
+        if 'mad' in methods:
+            robust_z = np.abs(values - stats['median']) / (MAD_SCALE * stats['mad'])
+            masks['mad'] = np.nan_to_num(robust_z, nan=0.0, posinf=0.0) > mad_threshold
+        if 'zscore' in methods:
+            z = np.abs(values - stats['mean']) / stats['std']
+            masks['zscore'] = np.nan_to_num(z, nan=0.0, posinf=0.0) > z_threshold
+    return masks
+
+
+def outlier_masks(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                  methods: Sequence[str] = METHODS, iqr_factor: float = 1.5,
+                  mad_threshold: float = 3.5, z_threshold: float = 3.0,
+                  stats: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Calcula as máscaras de outliers de todas as colunas numéricas em uma passada.
+
+    Args:
+        df: DataFrame de entrada
+        columns: Colunas a verificar (se None, usa todas as numéricas)
+        methods: Métodos a aplicar ('iqr', 'mad' e/ou 'zscore')
+        iqr_factor: Multiplicador do IQR para os limites inferior e superior
+        mad_threshold: Limiar do z-score robusto baseado no MAD
+        z_threshold: Limiar do z-score clássico
+        stats: Estatísticas pré-calculadas (ex: `StreamingOutlierStats.stats()`);
+              se None, são calculadas a partir de `df`
+
+    Returns:
+        Dicionário com o método como chave e um DataFrame booleano (linhas x
+        colunas) como valor
+    """
+    invalid = set(methods) - set(METHODS)
+    if invalid:
+        raise ValueError(f"Método inválido. Use {', '.join(repr(m) for m in METHODS)}.")
+
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    if stats is None:
+        stats = _column_stats(values)
+
+    masks = _masks_from_stats(values, stats, methods, iqr_factor, mad_threshold, z_threshold)
+    return {method: pd.DataFrame(mask, index=df.index, columns=columns)
+            for method, mask in masks.items()}
+
+
+def isolation_forest_scores(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                            contamination='auto', n_jobs: int = -1,
+                            random_state: int = 42) -> Tuple[pd.Series, pd.Series]:
+    """
+    Calcula o score de anomalia do Isolation Forest, com as árvores em paralelo.
+
+    Valores ausentes são preenchidos com a mediana da coluna antes do ajuste.
+
+    Args:
+        df: DataFrame de entrada
+        columns: Colunas usadas (se None, usa todas as numéricas)
+        contamination: Proporção esperada de outliers ('auto' ou float)
+        n_jobs: Número de processos paralelos (-1 usa todos os núcleos)
+        random_state: Semente para reprodutibilidade
+
+    Returns:
+        Tupla com o score de cada linha (quanto menor, mais anômalo) e a
+        máscara booleana das linhas consideradas outliers
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    medians = np.nanmedian(values, axis=0)
+    missing = np.isnan(values)
+    values[missing] = np.take(medians, np.nonzero(missing)[1])
+
+    forest = IsolationForest(contamination=contamination, n_jobs=n_jobs,
+                             random_state=random_state)
+    labels = forest.fit_predict(values)
+    scores = pd.Series(forest.score_samples(values), index=df.index, name='iforest_score')
+    return scores, pd.Series(labels == -1, index=df.index, name='iforest_outlier')
+
+
+@profiled()
+def detect_outliers(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                    methods: Sequence[str] = ('iqr',), min_methods: int = 1,
+                    iqr_factor: float = 1.5, mad_threshold: float = 3.5,
+                    z_threshold: float = 3.0, isolation_forest: bool = False,
+                    n_jobs: int = -1, stats: Optional[Dict[str, np.ndarray]] = None,
+                    row_rule: str = 'any', verbose: bool = True) -> Tuple[pd.Series, dict]:
+    """
+    Identifica as linhas com outliers e resume quantas linhas e colunas foram afetadas.
+
+    Uma célula é outlier quando pelo menos `min_methods` dos métodos a marcam;
+    uma linha é outlier quando tem alguma célula outlier (`row_rule='any'`) ou
+    quando todas as colunas verificadas são outliers (`row_rule='all'`). Com
+    `isolation_forest=True`, as linhas marcadas pelo Isolation Forest também
+    entram.
+
+    Args:
+        df: DataFrame de entrada
+        columns: Colunas a verificar (se None, usa todas as numéricas)
+        methods: Métodos a aplicar ('iqr', 'mad' e/ou 'zscore')
+        min_methods: Número mínimo de métodos que precisam concordar
+        iqr_factor: Multiplicador do IQR
+        mad_threshold: Limiar do z-score robusto
+        z_threshold: Limiar do z-score clássico
+        isolation_forest: Se True, também aplica o Isolation Forest
+        n_jobs: Processos paralelos do Isolation Forest
+        stats: Estatísticas pré-calculadas (ver `StreamingOutlierStats`)
+        row_rule: 'any' (alguma coluna) ou 'all' (todas as colunas) para marcar a linha
+        verbose: Se True, imprime o relatório
+
+    Returns:
+        Tupla com a máscara booleana de linhas outliers e o relatório
+    """
+    if row_rule not in ('any', 'all'):
+        raise ValueError("Regra inválida. Use 'any' ou 'all'.")
+
+    masks = outlier_masks(df, columns, methods, iqr_factor, mad_threshold, z_threshold, stats)
+    votes = sum(mask.to_numpy(dtype=np.uint8) for mask in masks.values())
+    cell_mask = votes >= min_methods
+    columns = list(next(iter(masks.values())).columns)
+
+    rows = cell_mask.all(axis=1) if row_rule == 'all' else cell_mask.any(axis=1)
+    row_mask = pd.Series(rows, index=df.index, name='outlier')
+    per_column = pd.Series(cell_mask.sum(axis=0), index=columns)
+
+    report = {
+        'rows_total': len(df),
+        'rows_affected': int(row_mask.sum()),
+        'columns_affected': int((per_column > 0).sum()),
+        'per_method_rows': {method: int(mask.any(axis=1).sum()) for method, mask in masks.items()},
+        'per_column': per_column[per_column > 0].sort_values(ascending=False).to_dict(),
+    }
+
+    if isolation_forest:
+        _, iforest_mask = isolation_forest_scores(df, columns, n_jobs=n_jobs)
+        report['per_method_rows']['isolation_forest'] = int(iforest_mask.sum())
+        row_mask |= iforest_mask
+        report['rows_affected'] = int(row_mask.sum())
+
+    if verbose:
+        print(f"\n{'='*50}")
+        print("DETECÇÃO DE OUTLIERS")
+        print(f"{'='*50}")
+        print(f"Linhas afetadas: {report['rows_affected']} de {report['rows_total']}")
+        print(f"Colunas afetadas: {report['columns_affected']} de {len(columns)}")
+        for method, count in report['per_method_rows'].items():
+            print(f"- {method}: {count} linhas")
+        print("="*50)
+
+    return row_mask, report
+
+
+class StreamingOutlierStats:
+    """
+    Estatísticas de outliers acumuladas bloco a bloco, para dados que não cabem em memória.
+
+    Média e desvio padrão são exatos (somas acumuladas). Quartis, mediana e MAD
+    são estimados a partir de uma amostra uniforme de tamanho fixo das linhas
+    (amostragem bottom-k: cada linha recebe uma chave aleatória e ficam as
+    `sample_size` menores), atualizada de forma vetorizada a cada bloco.
+
+    Args:
+        columns: Colunas numéricas acompanhadas
+        sample_size: Número de linhas mantidas na amostra
+        random_state: Semente para reprodutibilidade
+
+    Exemplo:
+        stats = StreamingOutlierStats(colunas)
+        for chunk in pd.read_csv('train.csv', chunksize=100_000):
+            stats.update(chunk)
+        mascara, relatorio = detect_outliers(df, colunas, stats=stats.stats())
+    """
+
+    def __init__(self, columns: List[str], sample_size: int = 100_000,
+                 random_state: int = 42):
+        self.columns = list(columns)
+        self.sample_size = sample_size
+        self._rng = np.random.default_rng(random_state)
+        n_cols = len(self.columns)
+        self._count = np.zeros(n_cols)
+        self._sum = np.zeros(n_cols)
+        self._sum_sq = np.zeros(n_cols)
+        self._sample = np.empty((0, n_cols))
+        self._keys = np.empty(0)
+
+    def update(self, chunk: pd.DataFrame) -> 'StreamingOutlierStats':
+        """
+        Acrescenta um bloco de linhas às estatísticas.
+
+        Args:
+            chunk: DataFrame com pelo menos as colunas acompanhadas
+
+        Returns:
+            O próprio objeto
+        """
+        values = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        self._count += present.sum(axis=0)
+        self._sum += filled.sum(axis=0)
+        self._sum_sq += np.square(filled).sum(axis=0)
+
+        keys = np.concatenate([self._keys, self._rng.random(len(values))])
+        sample = np.concatenate([self._sample, values])
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, sample = keys[keep], sample[keep]
+        self._keys, self._sample = keys, sample
+        return self
+
+    def stats(self) -> Dict[str, np.ndarray]:
+        """
+        Retorna as estatísticas no formato aceito por `outlier_masks` e `detect_outliers`.
+        """
+        robust = _column_stats(self._sample)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = self._sum / self._count
+            variance = np.maximum(self._sum_sq / self._count - np.square(mean), 0.0)
+        robust['mean'] = mean
+        robust['std'] = np.sqrt(variance)
+        return robust
+
+
+class OutlierClipper(BaseEstimator, TransformerMixin):
+    """
+    Transformador que limita os valores de cada coluna aos limites do IQR.
+
+    Os limites (Q1 - fator*IQR, Q3 + fator*IQR) são aprendidos no `fit`; no
+    `transform` os valores são limitados com `np.clip`, preservando o dtype de
+    entrada (float32 ou float64).
+
+    Colunas com IQR zero (ex: PoolArea, MiscVal, quase sempre 0) teriam os dois
+    limites iguais e virariam constantes; nelas são usados os quantis de
+    `fallback_quantiles` e, se estes também coincidirem, a coluna não é limitada.
+
+    Args:
+        iqr_factor: Multiplicador do IQR para os limites
+        fallback_quantiles: Quantis (inferior, superior) usados nas colunas com
+                           IQR zero
+    """
+
+    def __init__(self, iqr_factor: float = 1.5,
+                 fallback_quantiles: Tuple[float, float] = (0.01, 0.99)):
+        self.iqr_factor = iqr_factor
+        self.fallback_quantiles = fallback_quantiles
+
+    def fit(self, X, y=None):
+        X = np.asarray(X, dtype=np.float64)
+        q_low, q1, q3, q_high = np.nanquantile(
+            X, [self.fallback_quantiles[0], 0.25, 0.75, self.fallback_quantiles[1]], axis=0
+        )
+        iqr = q3 - q1
+        zero_iqr = ~(iqr > 0)
+        lower = np.where(zero_iqr, q_low, q1 - self.iqr_factor * iqr)
+        upper = np.where(zero_iqr, q_high, q3 + self.iqr_factor * iqr)
+        unbounded = ~(upper > lower)
+        self.lower_ = np.where(unbounded, -np.inf, lower)
+        self.upper_ = np.where(unbounded, np.inf, upper)
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def transform(self, X):
+        X = np.array(X, dtype=np.result_type(np.asarray(X).dtype, np.float32), copy=True)
+        return np.clip(X, self.lower_.astype(X.dtype), self.upper_.astype(X.dtype), out=X)
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is None:
+            input_features = [f'x{i}' for i in range(self.n_features_in_)]
+        return np.asarray(input_features, dtype=object)
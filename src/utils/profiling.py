@@ -0,0 +1,376 @@
+"""
+Módulo de instrumentação opcional das etapas do pipeline.
+
+Registra tempo de parede, tempo de CPU, o pico de memória residente (RSS)
+durante a etapa, amostrado em paralelo, a variação do RSS entre o início e o
+fim da etapa, linhas por segundo e formato da saída de cada etapa. Os passos
+internos do `create_preprocessor` (imputação, escala, one-hot) são medidos
+individualmente por `ProfiledStep`. A coleta fica desligada por padrão;
+enquanto desligada, o decorador apenas verifica uma flag e chama a função, e
+`profile_stage` entrega um medidor inerte, de modo que `stage.set_output(...)`
+funciona nos dois casos.
+
+Exemplo:
+    from src.utils import profiling
+    profiling.enable_profiling()
+    with profiling.profile_stage('fit_transform', rows=len(X)) as stage:
+        X_t = preprocessor.fit_transform(X)
+        stage.set_output(X_t)
+    print(profiling.summary_table())
+    profiling.export_chrome_trace('outputs/trace.json')
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_enabled = False
+_records = []
+_lock = threading.Lock()
+_origin = time.perf_counter()
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def enable_profiling(reset: bool = True) -> None:
+    """
+    Liga a coleta de medições.
+
+    Args:
+        reset: Se True, descarta as medições anteriores
+    """
+    global _enabled, _origin
+    if reset:
+        clear_records()
+        _origin = time.perf_counter()
+    _enabled = True
+
+
+def disable_profiling() -> None:
+    """Desliga a coleta de medições (as já registradas são mantidas)."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Indica se a coleta de medições está ligada."""
+    return _enabled
+
+
+def clear_records() -> None:
+    """Descarta todas as medições registradas."""
+    with _lock:
+        _records.clear()
+
+
+def get_records() -> list:
+    """Retorna uma cópia das medições registradas."""
+    with _lock:
+        return list(_records)
+
+
+def current_rss_mb() -> Optional[float]:
+    """Memória residente atual do processo, em MB (None onde `/proc` não existe)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1024 ** 2
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def _max_rss_mb() -> Optional[float]:
+    """
+    Pico de memória residente do processo desde o início, em MB.
+
+    É o máximo de toda a vida do processo (`ru_maxrss`), não de uma etapa.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB e macOS em bytes
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _shape_of(obj) -> Optional[list]:
+    """Extrai o formato de um objeto ou dos elementos de uma tupla."""
+    if hasattr(obj, 'shape'):
+        return [list(obj.shape)]
+    if isinstance(obj, tuple):
+        shapes = [list(item.shape) for item in obj if hasattr(item, 'shape')]
+        return shapes or None
+    return None
+
+
+class RSSSampler:
+    """
+    Amostra o RSS do processo em uma thread enquanto um bloco executa.
+
+    Após o bloco `with`, `peak_delta` tem o maior RSS observado menos o RSS no
+    início do bloco, em MB (None quando o RSS não pode ser lido).
+
+    Args:
+        interval: Intervalo entre amostras, em segundos
+    """
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.peak_delta = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, current_rss_mb())
+
+    def __enter__(self) -> 'RSSSampler':
+        self._start = current_rss_mb()
+        if self._start is not None:
+            self._peak = self._start
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._start is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._peak = max(self._peak, current_rss_mb())
+        self.peak_delta = self._peak - self._start
+
+
+class StageTimer:
+    """Medição de uma etapa em andamento, retornada por `profile_stage`."""
+
+    def __init__(self, name: str, rows: Optional[int] = None):
+        self.name = name
+        self.rows = rows
+        self.output_shape = None
+
+    def set_output(self, obj) -> None:
+        """
+        Registra o formato da saída da etapa.
+
+        Se o número de linhas não foi informado, usa o da saída.
+        """
+        self.output_shape = _shape_of(obj)
+        if self.rows is None and self.output_shape:
+            self.rows = self.output_shape[0][0] if self.output_shape[0] else None
+
+
+class _NullStageTimer(StageTimer):
+    """Medidor inerte entregue por `profile_stage` com a coleta desligada."""
+
+    def set_output(self, obj) -> None:
+        pass
+
+
+_NULL_TIMER = _NullStageTimer('')
+
+
+@contextmanager
+def profile_stage(name: str, rows: Optional[int] = None):
+    """
+    Context manager que mede uma etapa.
+
+    Args:
+        name: Nome da etapa
+        rows: Número de linhas processadas (para calcular linhas por segundo)
+
+    Yields:
+        StageTimer para registrar a saída (inerte se a coleta estiver desligada)
+    """
+    if not _enabled:
+        yield _NULL_TIMER
+        return
+
+    timer = StageTimer(name, rows)
+    sampler = RSSSampler()
+    rss_start = current_rss_mb()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with sampler:
+            yield timer
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        rss_end = current_rss_mb()
+        record = {
+            'stage': name,
+            'start_s': wall_start - _origin,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'peak_rss_mb': sampler.peak_delta,
+            'rss_delta_mb': rss_end - rss_start if rss_start is not None else None,
+            'max_rss_mb': _max_rss_mb(),
+            'rows': timer.rows,
+            'rows_per_s': timer.rows / wall if timer.rows and wall > 0 else None,
+            'output_shape': timer.output_shape,
+            'pid': os.getpid(),
+            'thread': threading.get_ident(),
+        }
+        with _lock:
+            _records.append(record)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """
+    Decorador que mede cada chamada da função com `profile_stage`.
+
+    O número de linhas vem do primeiro argumento com atributo `shape` (ou da
+    saída), e o formato da saída é registrado automaticamente.
+
+    Args:
+        name: Nome da etapa (padrão: nome da função)
+    """
+    def decorator(func: Callable) -> Callable:
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            rows = next((len(arg) for arg in args if hasattr(arg, 'shape')), None)
+            with profile_stage(stage_name, rows) as timer:
+                result = func(*args, **kwargs)
+                timer.set_output(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class ProfiledStep(BaseEstimator, TransformerMixin):
+    """
+    Envolve um passo de Pipeline para medir o seu fit e transform com `profile_stage`.
+
+    Os atributos ajustados do passo (ex: `mean_`, `categories_`) continuam
+    acessíveis pelo envoltório. Com a coleta desligada, o custo é o de uma
+    chamada a mais.
+
+    Args:
+        step: Transformador envolvido
+        name: Nome da etapa nas medições (ex: 'num.imputer')
+    """
+
+    def __init__(self, step, name: str):
+        self.step = step
+        self.name = name
+
+    def fit(self, X, y=None):
+        with profile_stage(f'{self.name}.fit', len(X)):
+            self.step.fit(X, y)
+        return self
+
+    def transform(self, X):
+        with profile_stage(f'{self.name}.transform', len(X)) as stage:
+            result = self.step.transform(X)
+            stage.set_output(result)
+        return result
+
+    def fit_transform(self, X, y=None, **fit_params):
+        with profile_stage(f'{self.name}.fit_transform', len(X)) as stage:
+            result = self.step.fit_transform(X, y, **fit_params)
+            stage.set_output(result)
+        return result
+
+    def get_feature_names_out(self, input_features=None):
+        return self.step.get_feature_names_out(input_features)
+
+    def __sklearn_is_fitted__(self) -> bool:
+        return hasattr(self.step, 'n_features_in_')
+
+    def __getattr__(self, attr):
+        # Só é chamado para atributos ausentes no envoltório
+        if attr.startswith('__') or attr in ('step', 'name'):
+            raise AttributeError(attr)
+        return getattr(self.step, attr)
+
+
+def export_log(path: Union[str, Path]) -> Path:
+    """
+    Salva as medições em JSON Lines (um registro por linha).
+
+    Args:
+        path: Caminho do arquivo de saída
+
+    Returns:
+        Caminho do arquivo salvo
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        for record in get_records():
+            f.write(json.dumps(record) + '\n')
+    return path
+
+
+def export_chrome_trace(path: Union[str, Path]) -> Path:
+    """
+    Salva as medições no formato Chrome Trace (abrir em chrome://tracing ou Perfetto).
+
+    Args:
+        path: Caminho do arquivo de saída
+
+    Returns:
+        Caminho do arquivo salvo
+    """
+    events = []
+    for record in get_records():
+        events.append({
+            'name': record['stage'],
+            'ph': 'X',
+            'ts': record['start_s'] * 1e6,
+            'dur': record['wall_s'] * 1e6,
+            'pid': record['pid'],
+            'tid': record['thread'],
+            'args': {key: record[key] for key in
+                     ('cpu_s', 'peak_rss_mb', 'rss_delta_mb', 'max_rss_mb', 'rows', 'rows_per_s', 'output_shape')},
+        })
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}))
+    return path
+
+
+def summary_table() -> pd.DataFrame:
+    """
+    Resume as medições por etapa.
+
+    Returns:
+        DataFrame com chamadas, tempo total e médio, CPU, maior pico e maior
+        variação de RSS de cada etapa e linhas por segundo, ordenado pelo
+        tempo total (o pico de RSS do processo, `max_rss_mb`, fica só nos
+        registros, pois não é uma medida por etapa)
+    """
+    records = get_records()
+    if not records:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(records)
+    summary = df.groupby('stage').agg(
+        calls=('wall_s', 'size'),
+        wall_total_s=('wall_s', 'sum'),
+        wall_mean_s=('wall_s', 'mean'),
+        cpu_total_s=('cpu_s', 'sum'),
+        peak_rss_mb=('peak_rss_mb', 'max'),
+        rss_delta_mb=('rss_delta_mb', 'max'),
+        rows_per_s=('rows_per_s', 'mean'),
+    )
+    return summary.sort_values('wall_total_s', ascending=False)
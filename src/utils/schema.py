@@ -0,0 +1,279 @@
+"""
+Módulo para validação do esquema dos dados no carregamento.
+
+O esquema é compilado uma vez a partir do DataFrame de treino e, se
+disponível, do `data_description.txt` (categorias válidas de cada coluna).
+Cada bloco lido do CSV passa por verificações vetorizadas de presença de
+colunas, tipos, faixas de valores e categorias permitidas, e o carregamento é
+interrompido no primeiro bloco com erro, antes de qualquer etapa de modelagem.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled
+
+CHECKS = ('columns', 'extra_columns', 'dtypes', 'categories', 'ranges')
+
+
+class SchemaValidationError(ValueError):
+    """Erro de validação do esquema, com a lista de problemas encontrados."""
+
+    def __init__(self, issues: List[dict], source: str = ''):
+        self.issues = issues
+        lines = [f"- {i['column']}: {i['check']} ({i['detail']})" for i in issues[:20]]
+        super().__init__(
+            f"Dados fora do esquema{' em ' + source if source else ''}:\n" + "\n".join(lines)
+        )
+
+
+def parse_data_description(path: Union[str, Path]) -> Dict[str, List[str]]:
+    """
+    Lê os códigos válidos de cada coluna no `data_description.txt` do Kaggle.
+
+    O código 'NA' é ignorado, pois o pandas o lê como valor ausente.
+
+    Args:
+        path: Caminho do arquivo de descrição
+
+    Returns:
+        Dicionário com o nome da coluna e a lista de códigos documentados
+        (colunas sem códigos, como as de área, ficam com lista vazia)
+    """
+    levels = {}
+    column = None
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if not line[0].isspace() and ':' in line:
+                column = line.split(':', 1)[0].strip()
+                levels[column] = []
+            elif column is not None and '\t' in line:
+                code = line.split('\t', 1)[0].strip()
+                if code and code != 'NA':
+                    levels[column].append(code)
+    return levels
+
+
+class DataSchema:
+    """
+    Esquema compilado dos dados de entrada.
+
+    Args:
+        columns: Dicionário com a especificação de cada coluna: 'kind'
+                ('numeric' ou 'categorical'), 'min'/'max' para numéricas e
+                'allowed' (valores permitidos) quando conhecidos
+        target: Coluna alvo (opcional nos arquivos de teste)
+        errors: Verificações que interrompem o carregamento; as demais só
+               geram avisos (por padrão, colunas extras e faixas de valores)
+        range_margin: Folga, em fração da amplitude de treino, antes de um
+                     valor numérico ser considerado fora da faixa
+    """
+
+    def __init__(self, columns: Dict[str, dict], target: Optional[str] = None,
+                 errors: Sequence[str] = ('columns', 'dtypes', 'categories'),
+                 range_margin: float = 0.5):
+        self.columns = columns
+        self.target = target
+        self.errors = tuple(errors)
+        self.range_margin = range_margin
+        self._allowed = {
+            col: (pd.Index(spec['allowed']) if spec.get('allowed') is not None else None)
+            for col, spec in columns.items()
+        }
+
+    @classmethod
+    def from_training(cls, train_df: pd.DataFrame, target: Optional[str] = None,
+                      description_path: Optional[Union[str, Path]] = None,
+                      id_column: Optional[str] = 'Id',
+                      **kwargs) -> 'DataSchema':
+        """
+        Compila o esquema a partir dos dados de treino.
+
+        As categorias permitidas são a união das vistas no treino com as
+        documentadas no `data_description.txt`. Colunas numéricas com códigos
+        documentados (ex: MSSubClass, OverallQual) também têm seus valores
+        restritos aos códigos.
+
+        Args:
+            train_df: DataFrame de treino
+            target: Coluna alvo
+            description_path: Caminho do `data_description.txt` (opcional)
+            id_column: Coluna de identificação, sem verificação de faixa
+            **kwargs: Parâmetros repassados ao construtor
+
+        Returns:
+            DataSchema compilado
+        """
+        documented = parse_data_description(description_path) if description_path else {}
+
+        columns = {}
+        for col in train_df.columns:
+            series = train_df[col]
+            codes = documented.get(col, [])
+            if col == id_column:
+                spec = {'kind': 'numeric'}
+            elif pd.api.types.is_numeric_dtype(series):
+                spec = {'kind': 'numeric',
+                        'min': float(series.min()), 'max': float(series.max())}
+                numeric_codes = pd.to_numeric(pd.Series(codes, dtype=object), errors='coerce')
+                if codes and numeric_codes.notna().all():
+                    spec['allowed'] = sorted(set(numeric_codes.tolist())
+                                             | set(series.dropna().unique().tolist()))
+            else:
+                spec = {'kind': 'categorical',
+                        'allowed': sorted(set(codes) | set(series.dropna().astype(str).unique()))}
+            columns[col] = spec
+
+        return cls(columns, target=target, **kwargs)
+
+    def to_json(self, path: Union[str, Path]) -> Path:
+        """Salva o esquema compilado em JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            'columns': self.columns, 'target': self.target,
+            'errors': list(self.errors), 'range_margin': self.range_margin,
+        }, indent=2, ensure_ascii=False))
+        return path
+
+    @classmethod
+    def from_json(cls, path: Union[str, Path]) -> 'DataSchema':
+        """Carrega um esquema salvo com `to_json`."""
+        content = json.loads(Path(path).read_text())
+        return cls(content['columns'], content['target'], content['errors'],
+                   content['range_margin'])
+
+    def read_dtypes(self) -> Dict[str, str]:
+        """
+        Tipos a usar no `pd.read_csv` para as colunas categóricas.
+
+        Sem eles, o tipo de uma coluna categórica depende do bloco: um bloco
+        só com valores ausentes (ex: Alley, PoolQC) vem como float ou object
+        em vez de texto.
+        """
+        return {col: 'str' for col, spec in self.columns.items() if spec['kind'] == 'categorical'}
+
+    def validate(self, df: pd.DataFrame) -> List[dict]:
+        """
+        Verifica um DataFrame (ou bloco) contra o esquema.
+
+        Args:
+            df: DataFrame a verificar
+
+        Returns:
+            Lista de problemas, cada um com coluna, verificação, quantidade de
+            linhas afetadas, detalhe e severidade ('erro' ou 'aviso')
+        """
+        issues = []
+
+        def add(column, check, count, detail):
+            severity = 'erro' if check in self.errors else 'aviso'
+            issues.append({'column': column, 'check': check, 'count': int(count),
+                           'detail': detail, 'severity': severity})
+
+        expected = [c for c in self.columns if c != self.target]
+        missing = [c for c in expected if c not in df.columns]
+        for col in missing:
+            add(col, 'columns', len(df), 'coluna ausente')
+        for col in df.columns.difference(list(self.columns)):
+            add(col, 'extra_columns', len(df), 'coluna não prevista no esquema')
+
+        for col in df.columns.intersection(list(self.columns)):
+            spec = self.columns[col]
+            series = df[col]
+            allowed = self._allowed[col]
+
+            if spec['kind'] == 'numeric':
+                if not pd.api.types.is_numeric_dtype(series):
+                    parsed = pd.to_numeric(series, errors='coerce')
+                    bad = parsed.isna() & series.notna()
+                    add(col, 'dtypes', bad.sum(),
+                        f"valores não numéricos, ex: {series[bad].head(3).tolist()}")
+                    series = parsed
+
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                if allowed is not None:
+                    bad = ~np.isin(values, allowed.to_numpy(dtype=np.float64)) & ~np.isnan(values)
+                    if bad.any():
+                        add(col, 'categories', bad.sum(),
+                            f"códigos não documentados, ex: {np.unique(values[bad])[:3].tolist()}")
+                elif 'min' in spec:
+                    margin = (spec['max'] - spec['min']) * self.range_margin
+                    with np.errstate(invalid='ignore'):
+                        bad = (values < spec['min'] - margin) | (values > spec['max'] + margin)
+                    if bad.any():
+                        add(col, 'ranges', bad.sum(),
+                            f"fora de [{spec['min']:g}, {spec['max']:g}] com folga de "
+                            f"{self.range_margin:.0%}, ex: {values[bad][:3].tolist()}")
+            elif allowed is not None:
+                if pd.api.types.is_numeric_dtype(series):
+                    series = series.astype(str).where(series.notna())
+                # Compara só os valores distintos; a máscara por linha só é
+                # calculada quando há categorias novas
+                uniques = pd.Series(series.unique()).dropna()
+                new = uniques[~uniques.isin(allowed)]
+                if len(new):
+                    add(col, 'categories', series.isin(new).sum(),
+                        f"categorias novas, ex: {new.head(3).tolist()}")
+
+        return issues
+
+
+@profiled()
+def read_csv_validated(path: Union[str, Path], schema: DataSchema,
+                       chunksize: int = 200_000, **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Lê um CSV em blocos, validando cada bloco assim que é lido.
+
+    O carregamento é interrompido no primeiro bloco com erro; os avisos são
+    impressos ao final. As colunas categóricas do esquema são lidas como texto
+    (ver `DataSchema.read_dtypes`), para que o resultado não dependa do tamanho
+    do bloco e seja igual a uma leitura direta com `pd.read_csv`.
+
+    Args:
+        path: Caminho do arquivo CSV
+        schema: Esquema compilado
+        chunksize: Número de linhas por bloco
+        **read_csv_kwargs: Argumentos adicionais para `pd.read_csv`
+
+    Returns:
+        DataFrame com todos os blocos
+
+    Raises:
+        SchemaValidationError: Se algum bloco violar uma verificação de erro
+    """
+    read_csv_kwargs['dtype'] = {**schema.read_dtypes(), **read_csv_kwargs.get('dtype', {})}
+    chunks = []
+    warnings = {}
+    start = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs):
+        issues = schema.validate(chunk)
+        errors = [i for i in issues if i['severity'] == 'erro']
+        if errors:
+            for issue in errors:
+                issue['detail'] += f" (linhas {start} a {start + len(chunk) - 1})"
+            raise SchemaValidationError(errors, str(path))
+        for issue in issues:
+            key = (issue['column'], issue['check'])
+            if key not in warnings:
+                warnings[key] = issue
+            else:
+                warnings[key]['count'] += issue['count']
+        chunks.append(chunk)
+        start += len(chunk)
+
+    if warnings:
+        print(f"\nAvisos de validação em {path}:")
+        for issue in warnings.values():
+            print(f"- {issue['column']}: {issue['check']} em {issue['count']} linhas "
+                  f"({issue['detail']})")
+
+    if not chunks:
+        return pd.read_csv(path, nrows=0, **read_csv_kwargs)
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
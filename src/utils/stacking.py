@@ -0,0 +1,183 @@
+"""
+Módulo para empilhamento (stacking) de modelos de regressão.
+
+Este módulo gera previsões out-of-fold (OOF) de várias famílias de modelos em
+paralelo, armazena as matrizes OOF em disco e ajusta um meta-modelo sobre elas.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import RidgeCV
+
+from .folds import make_fold_plan
+from .profiling import profiled, profile_stage
+
+
+def make_folds(n_samples: int, n_splits: int = 5,
+               random_state: int = 42) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Gera os índices de treino e validação de um K-fold embaralhado.
+
+    Args:
+        n_samples: Número de linhas do conjunto de treino
+        n_splits: Número de folds
+        random_state: Semente para reprodutibilidade
+
+    Returns:
+        Lista de tuplas (índices de treino, índices de validação)
+    """
+    return make_fold_plan(n_samples, 'kfold', n_splits=n_splits, random_state=random_state)
+
+
+def _fit_predict_fold(model, X: np.ndarray, y: np.ndarray, train_idx: np.ndarray,
+                      val_idx: np.ndarray, X_test: Optional[np.ndarray]) -> tuple:
+    """Treina uma cópia do modelo em um fold e prevê a validação e o teste."""
+    model = clone(model)
+    model.fit(X[train_idx], y[train_idx])
+    val_pred = model.predict(X[val_idx])
+    test_pred = model.predict(X_test) if X_test is not None else None
+    return val_pred, test_pred
+
+
+@profiled()
+def compute_oof_predictions(models: Dict[str, object], X: np.ndarray, y: np.ndarray,
+                            X_test: Optional[np.ndarray] = None,
+                            folds: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None,
+                            cache_dir: Optional[Union[str, Path]] = None,
+                            n_jobs: int = -1) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    """
+    Gera as previsões out-of-fold de cada modelo base.
+
+    Todos os modelos usam os mesmos folds e a mesma matriz pré-processada. Os
+    pares (modelo, fold) ainda não calculados são treinados em paralelo; o
+    joblib mapeia matrizes grandes em memória compartilhada entre os workers,
+    evitando uma cópia de X por tarefa. Se `cache_dir` for informado, cada
+    modelo é salvo em um arquivo próprio, identificado pelos seus
+    hiperparâmetros, pelos dados e pelos folds, de modo que adicionar um novo
+    modelo base não retreina os demais.
+
+    Toda linha precisa estar na validação de ao menos um fold. Em planos
+    repetidos (`'repeated'`), a previsão OOF de cada linha é a média das
+    repetições em que ela foi validada.
+
+    Args:
+        models: Dicionário com o nome do modelo como chave e o estimador como valor
+        X: Matriz de features já pré-processada
+        y: Variável alvo
+        X_test: Matriz de teste pré-processada (opcional)
+        folds: Plano de folds (ver `folds.make_fold_plan`); se None, usa `make_folds`
+        cache_dir: Diretório para armazenar as previsões OOF (opcional)
+        n_jobs: Número de processos paralelos (-1 usa todos os núcleos)
+
+    Returns:
+        Tupla com o DataFrame de previsões OOF (uma coluna por modelo) e o
+        DataFrame com a média das previsões de teste por fold (ou None)
+
+    Raises:
+        ValueError: Se alguma linha não for validada em nenhum fold
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    if X_test is not None:
+        X_test = np.asarray(X_test)
+    if folds is None:
+        folds = make_folds(len(y))
+
+    # Quantas vezes cada linha é validada; linhas sem previsão OOF invalidam o stacking
+    val_counts = np.bincount(np.concatenate([val_idx for _, val_idx in folds]),
+                             minlength=len(y))
+    if (val_counts == 0).any():
+        raise ValueError(
+            f"{int((val_counts == 0).sum())} linhas não estão na validação de nenhum fold. "
+            "Use um plano que cubra todas as linhas (ex: 'kfold' ou 'repeated')."
+        )
+
+    # Identificador comum aos dados e folds; cada modelo acrescenta seus parâmetros
+    data_key = joblib.hash((X, y, X_test, [val_idx for _, val_idx in folds]))
+
+    if cache_dir is not None:
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    oof = {}
+    test = {}
+    pending = {}
+    for name, model in models.items():
+        cache_file = None
+        if cache_dir is not None:
+            model_key = joblib.hash((data_key, type(model).__name__, model.get_params()))
+            cache_file = cache_dir / f"oof_{name}_{model_key[:12]}.npz"
+            if cache_file.exists():
+                with np.load(cache_file) as cached:
+                    oof[name] = cached['oof']
+                    test[name] = cached['test'] if 'test' in cached else None
+                continue
+        pending[name] = cache_file
+
+    # Um único pool para todos os pares (modelo, fold) equilibra melhor a carga
+    tasks = [(name, fold) for name in pending for fold in range(len(folds))]
+    with profile_stage('oof_fold_fits', rows=len(y) * len(pending)):
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_predict_fold)(models[name], X, y, *folds[fold], X_test)
+            for name, fold in tasks
+        )
+
+    for name, cache_file in pending.items():
+        oof_pred = np.zeros(len(y), dtype=np.float64)
+        test_preds = []
+        for (task_name, fold), (val_pred, test_pred) in zip(tasks, results):
+            if task_name != name:
+                continue
+            oof_pred[folds[fold][1]] += val_pred
+            if test_pred is not None:
+                test_preds.append(test_pred)
+        oof_pred /= val_counts
+        oof[name] = oof_pred
+        test[name] = np.mean(test_preds, axis=0) if test_preds else None
+
+        if cache_file is not None:
+            arrays = {'oof': oof_pred}
+            if test[name] is not None:
+                arrays['test'] = test[name]
+            np.savez(cache_file, **arrays)
+
+    oof_df = pd.DataFrame({name: oof[name] for name in models})
+    test_df = None
+    if X_test is not None:
+        test_df = pd.DataFrame({name: test[name] for name in models})
+    return oof_df, test_df
+
+
+@profiled()
+def fit_meta_model(oof_predictions: pd.DataFrame, y: np.ndarray, meta_model=None):
+    """
+    Ajusta o meta-modelo sobre as previsões out-of-fold dos modelos base.
+
+    Args:
+        oof_predictions: DataFrame retornado por `compute_oof_predictions`
+        y: Variável alvo
+        meta_model: Estimador usado como meta-modelo (padrão: RidgeCV)
+
+    Returns:
+        Meta-modelo treinado
+    """
+    if meta_model is None:
+        meta_model = RidgeCV(alphas=np.logspace(-3, 3, 13))
+    meta_model.fit(oof_predictions.values, np.asarray(y))
+
+    # Exibir os pesos atribuídos a cada modelo base, quando disponíveis
+    if hasattr(meta_model, 'coef_'):
+        print(f"\n{'='*50}")
+        print("Pesos do Meta-Modelo")
+        print(f"{'='*50}")
+        for name, coef in zip(oof_predictions.columns, np.ravel(meta_model.coef_)):
+            print(f"{name}: {coef:.4f}")
+        print("="*50)
+
+    return meta_model
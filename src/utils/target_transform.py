@@ -0,0 +1,186 @@
+"""
+Módulo com o regressor que transforma a variável alvo.
+
+Este módulo contém um wrapper que aplica log1p, Box-Cox ou Yeo-Johnson ao alvo
+no treino e desfaz a transformação automaticamente na previsão.
+"""
+
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.base import BaseEstimator, RegressorMixin, clone
+
+from .evaluation import evaluate_model
+from .profiling import profiled
+
+
+def _slice_rows(X, start: int, stop: int):
+    """Seleciona um intervalo de linhas de um DataFrame ou array."""
+    if isinstance(X, (pd.DataFrame, pd.Series)):
+        return X.iloc[start:stop]
+    return X[start:stop]
+
+
+class TargetTransformRegressor(BaseEstimator, RegressorMixin):
+    """
+    Regressor que treina o modelo sobre o alvo transformado.
+
+    A transformação é ajustada uma única vez em `fit`. Em `predict`, a inversa
+    é aplicada diretamente sobre o array de previsões (in-place), sem alocar
+    arrays temporários do tamanho da saída.
+
+    Args:
+        regressor: Estimador ou Pipeline a ser treinado
+        method: Transformação do alvo ('log1p', 'box-cox' ou 'yeo-johnson')
+    """
+
+    METHODS = ('log1p', 'box-cox', 'yeo-johnson')
+
+    def __init__(self, regressor, method: str = 'log1p'):
+        self.regressor = regressor
+        self.method = method
+
+    def _transform_target(self, y: np.ndarray) -> np.ndarray:
+        """Aplica a transformação ajustada ao alvo."""
+        if self.method == 'log1p':
+            return np.log1p(y)
+        if self.method == 'box-cox':
+            return stats.boxcox(y, lmbda=self.lambda_)
+        return stats.yeojohnson(y, lmbda=self.lambda_)
+
+    def inverse_transform(self, y_t: np.ndarray) -> np.ndarray:
+        """
+        Desfaz a transformação do alvo, sobrescrevendo o array recebido.
+
+        Args:
+            y_t: Array float com valores na escala transformada
+
+        Returns:
+            O mesmo array, agora na escala original
+        """
+        lmbda = self.lambda_
+        if self.method == 'log1p':
+            np.expm1(y_t, out=y_t)
+        elif self.method == 'box-cox':
+            if lmbda == 0:
+                np.exp(y_t, out=y_t)
+            else:
+                y_t *= lmbda
+                y_t += 1
+                np.power(y_t, 1 / lmbda, out=y_t)
+        else:
+            pos = y_t >= 0
+            neg = ~pos
+            if lmbda == 0:
+                y_t[pos] = np.expm1(y_t[pos])
+            else:
+                y_t[pos] = np.power(y_t[pos] * lmbda + 1, 1 / lmbda) - 1
+            if lmbda == 2:
+                y_t[neg] = -np.expm1(-y_t[neg])
+            else:
+                y_t[neg] = 1 - np.power(1 - (2 - lmbda) * y_t[neg], 1 / (2 - lmbda))
+        return y_t
+
+    @profiled('TargetTransformRegressor.fit')
+    def fit(self, X, y, **fit_params):
+        """
+        Ajusta a transformação do alvo e treina o regressor.
+
+        Args:
+            X: Features de treino
+            y: Variável alvo na escala original
+            **fit_params: Argumentos adicionais para o fit do regressor
+
+        Returns:
+            O próprio objeto treinado
+        """
+        if self.method not in self.METHODS:
+            raise ValueError(
+                f"Método inválido. Use {', '.join(repr(m) for m in self.METHODS)}."
+            )
+
+        y = np.asarray(y, dtype=np.float64)
+        if self.method == 'log1p':
+            self.lambda_ = None
+            y_t = np.log1p(y)
+        elif self.method == 'box-cox':
+            y_t, self.lambda_ = stats.boxcox(y)
+        else:
+            y_t, self.lambda_ = stats.yeojohnson(y)
+
+        self.regressor_ = clone(self.regressor)
+        self.regressor_.fit(X, y_t, **fit_params)
+        return self
+
+    @profiled('TargetTransformRegressor.predict')
+    def predict(self, X, chunk_size: Optional[int] = None,
+                transformed: bool = False) -> np.ndarray:
+        """
+        Faz previsões na escala original do alvo.
+
+        Args:
+            X: Features
+            chunk_size: Se informado, prevê em blocos com esse número de linhas,
+                       escrevendo cada bloco direto no array de saída
+            transformed: Se True, retorna as previsões na escala transformada
+
+        Returns:
+            Array com as previsões
+        """
+        if chunk_size is None:
+            y_pred = np.asarray(self.regressor_.predict(X), dtype=np.float64)
+            return y_pred if transformed else self.inverse_transform(y_pred)
+
+        y_pred = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), chunk_size):
+            stop = min(start + chunk_size, len(X))
+            block = y_pred[start:stop]
+            block[:] = self.regressor_.predict(_slice_rows(X, start, stop))
+            if not transformed:
+                self.inverse_transform(block)
+        return y_pred
+
+    def predict_stream(self, chunks: Iterable) -> Iterator[np.ndarray]:
+        """
+        Faz previsões sobre um iterável de blocos (ex: `pd.read_csv(chunksize=...)`).
+
+        Args:
+            chunks: Iterável de DataFrames ou arrays com as features
+
+        Yields:
+            Array com as previsões de cada bloco, na escala original
+        """
+        for chunk in chunks:
+            y_pred = np.asarray(self.regressor_.predict(chunk), dtype=np.float64)
+            yield self.inverse_transform(y_pred)
+
+    @profiled('TargetTransformRegressor.evaluate')
+    def evaluate(self, X, y, model_name: str = 'Modelo',
+                 chunk_size: Optional[int] = None) -> dict:
+        """
+        Avalia o modelo nas escalas transformada e original com uma única previsão.
+
+        Args:
+            X: Features
+            y: Valores reais na escala original
+            model_name: Nome do modelo para exibição
+            chunk_size: Tamanho do bloco repassado a `predict`
+
+        Returns:
+            Dicionário com as métricas em cada escala ('transformado' e 'original')
+        """
+        y = np.asarray(y, dtype=np.float64)
+        y_pred = self.predict(X, chunk_size=chunk_size, transformed=True)
+
+        metrics = {
+            'transformado': evaluate_model(
+                self._transform_target(y), y_pred, f"{model_name} ({self.method})"
+            )
+        }
+        # A inversa reaproveita o mesmo array de previsões
+        metrics['original'] = evaluate_model(
+            y, self.inverse_transform(y_pred), f"{model_name} (escala original)"
+        )
+        return metrics
@@ -10,17 +10,22 @@ from typing import Tuple, Union, List, Dict, Optional
 from pathlib import Path
 
 
-def carregar_dados(caminho_arquivo: str) -> pd.DataFrame:
+def carregar_dados(caminho_arquivo: str, esquema=None) -> pd.DataFrame:
     """
     Carrega os dados de um arquivo CSV.
     
     Args:
         caminho_arquivo: Caminho para o arquivo CSV
+        esquema: DataSchema opcional (ver `src.utils.schema`); se informado, cada
+                bloco lido é validado e o carregamento para no primeiro erro
         
     Returns:
         DataFrame do pandas com os dados carregados
     """
     try:
+        if esquema is not None:
+            from src.utils.schema import read_csv_validated
+            return read_csv_validated(caminho_arquivo, esquema)
         return pd.read_csv(caminho_arquivo)
     except Exception as e:
         print(f"Erro ao carregar o arquivo {caminho_arquivo}: {e}")
@@ -221,6 +226,8 @@ def dividir_dados(X: pd.DataFrame, y: pd.Series, tamanho_teste: float = 0.2, see
         
     Returns:
         Tupla com X_train, X_test, y_train, y_test
+        
+    Para obter apenas os índices, sem copiar X e y, use `src.utils.folds.holdout_indices`.
     """
     from sklearn.model_selection import train_test_split
     return train_test_split(X, y, test_size=tamanho_teste, random_state=seed)
@@ -249,7 +256,7 @@ if __name__ == "__main__":
     # Exemplo de uso
     print("Módulo de pré-processamento carregado com sucesso!")
     print("Funções disponíveis:")
-    print("- carregar_dados(caminho_arquivo)")
+    print("- carregar_dados(caminho_arquivo, esquema=None)")
     print("- analisar_dados(df, mostrar_amostra=True)")
     print("- analisar_valores_ausentes(df, limite_porcentagem=30.0)")
     print("- preencher_valores_numericos(df, estrategia='mediana', colunas=None)")